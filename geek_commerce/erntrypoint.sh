@@ -1,7 +1,21 @@
 #!/bin/sh
+set -e
+
+if [ "$DEBUG" != "True" ] && [ -z "$ALLOWED_HOSTS" ]; then
+    echo "ALLOWED_HOSTS es obligatorio con DEBUG=False (ej: ALLOWED_HOSTS=midominio.com)" >&2
+    exit 1
+fi
 
 echo "Running database migrations..."
 python manage.py migrate
 
-echo "Starting the Django development server..."
-python manage.py runserver 0.0.0:8000
\ No newline at end of file
+if [ "$DEBUG" = "True" ]; then
+    echo "Starting the Django development server..."
+    exec python manage.py runserver 0.0.0.0:8000
+fi
+
+echo "Collecting static files..."
+python manage.py collectstatic --noinput
+
+echo "Starting gunicorn (preloaded app, role: ${SERVER_ROLE:-all})..."
+exec gunicorn geek_commerce.wsgi:application --config gunicorn.conf.py
@@ -26,24 +26,36 @@ SECRET_KEY = os.environ.get('SECRET_KEY')
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = os.environ.get('DEBUG', 'False') == 'True'
 
-ALLOWED_HOSTS = []
+# Obligatorio con DEBUG=False: sin hosts permitidos Django responde 400 a todos los requests
+ALLOWED_HOSTS = [host for host in os.environ.get('ALLOWED_HOSTS', '').split(',') if host]
+
+# Rol del proceso: 'all' (por defecto), 'storefront' (solo tienda) o 'admin'.
+# Los workers 'storefront' no montan el admin ni importan los módulos admin.py
+# (ni django_json_widget), así arrancan más rápido y ocupan menos memoria.
+SERVER_ROLE = os.environ.get('SERVER_ROLE', 'all')
+SERVE_ADMIN = SERVER_ROLE != 'storefront'
 
 
 # Application definition
 
 INSTALLED_APPS = [
-    'django.contrib.admin',
+    # SimpleAdminConfig no ejecuta autodiscover(): los admin.py no se importan
+    'django.contrib.admin' if SERVE_ADMIN else 'django.contrib.admin.apps.SimpleAdminConfig',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'django_json_widget',
     'shop',
 ]
 
 MIDDLEWARE = [
+    'geek_commerce.startup.FirstRequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    # Sirve los estáticos (admin, editores JSON, subidas por partes) cuando corre gunicorn con DEBUG=False
+    'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -122,8 +134,40 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/6.0/howto/static-files/
 
 STATIC_URL = 'static/'
+# Destino de collectstatic (lo ejecuta erntrypoint.sh antes de levantar gunicorn)
+STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedStaticFilesStorage',
+    },
+}
 
 # Configure Media File Handling (for Image Uploads) 
 
 MEDIA_URL = '/media/'
-MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
\ No newline at end of file
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Tamaño máximo de una imagen subida por partes desde el admin (bytes)
+IMAGE_UPLOAD_MAX_SIZE = int(os.environ.get('IMAGE_UPLOAD_MAX_SIZE', 50 * 1024 * 1024))
+
+# Logging de arranque (tiempos de importación, precalentamiento y primer request por worker)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'geek_commerce.startup': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
+# Autocompletado del buscador (caché de prefijos por proceso)
+
+AUTOCOMPLETE_REFRESH_SECONDS = int(os.environ.get('AUTOCOMPLETE_REFRESH_SECONDS', '60'))
+AUTOCOMPLETE_MAX_PRODUCTS = int(os.environ.get('AUTOCOMPLETE_MAX_PRODUCTS', '20000'))
\ No newline at end of file
@@ -20,9 +20,13 @@ from django.conf import settings
 from django.conf.urls.static import static
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
+    path('', include('shop.urls')),
 ]
 
+# Los workers de la tienda (SERVER_ROLE=storefront) no montan el admin
+if settings.SERVE_ADMIN:
+    urlpatterns.insert(0, path('admin/', admin.site.urls))
+
 # Only add this during development
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
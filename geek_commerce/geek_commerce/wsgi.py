@@ -7,10 +7,16 @@ For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/wsgi/
 """
 
+import logging
 import os
+import time
 
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'geek_commerce.settings')
 
+_started = time.perf_counter()
 application = get_wsgi_application()
+logging.getLogger('geek_commerce.startup').info(
+    "Django importado en %.1fms (pid %s)", (time.perf_counter() - _started) * 1000, os.getpid()
+)
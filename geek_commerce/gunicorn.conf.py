@@ -0,0 +1,22 @@
+# Configuración de gunicorn para producción (la usa erntrypoint.sh cuando DEBUG no es True).
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '60'))
+accesslog = '-'
+
+# Importa Django una sola vez en el proceso maestro; los workers nacen por fork con todo cargado.
+preload_app = True
+
+
+def when_ready(server):
+    # Se ejecuta en el maestro, con la app ya importada y antes de crear los workers
+    from geek_commerce.startup import warm_up
+
+    try:
+        warm_up()
+    except Exception:
+        # El precalentamiento es una optimización: si falla, los workers arrancan igual
+        server.log.exception("Falló el precalentamiento de la aplicación")
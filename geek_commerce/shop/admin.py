@@ -1,14 +1,94 @@
+import re
+
 from django.contrib import admin
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
 from django.db.models import JSONField
+from django.forms.models import BaseInlineFormSet
 from django.utils.html import mark_safe # Para mostrar vista previa
 from django_json_widget.widgets import JSONEditorWidget
-from .models import Category, Brand, Product, ProductVariant, ProductImage
+from .models import Category, Brand, Product, ProductVariant, ProductImage, set_products_active
+from .widgets import LazyJSONEditorWidget
 
 # Register your models here.
+# --- INLINES PAGINADOS (para productos con muchas variantes / imágenes) ---
+class PaginatedInlineFormSet(BaseInlineFormSet):
+    '''
+    Formset de inline que solo carga una página de filas existentes (?<prefijo>-page=N).
+    En el POST no se vuelve a calcular la página: se cargan exactamente las filas cuyos ids vienen en el
+    formulario, así los cambios hechos por otros entre el GET y el POST (altas, renombres, bajas) no
+    corren filas de una página a otra.
+    Las filas existentes que no cambiaron se marcan como empty_permitted: no se validan ni se guardan.
+    '''
+    per_page = 10
+    request = None
+
+    @property
+    def page_param(self):
+        return f"{self.prefix}-page"
+
+    def _posted_pks(self):
+        '''
+        Ids de las filas existentes enviadas en el POST (<prefijo>-N-id).
+        '''
+        pk_field = self.model._meta.pk
+        pattern = re.compile(rf"{re.escape(self.prefix)}-\d+-{re.escape(pk_field.name)}")
+        pks = set()
+        for key, value in self.data.items():
+            if value and pattern.fullmatch(key):
+                try:
+                    pks.add(pk_field.to_python(value))
+                except ValidationError:
+                    pass
+        return pks
+
+    def get_queryset(self):
+        if not hasattr(self, '_queryset'):
+            queryset = super().get_queryset()
+            # El nombre no es único: el pk desempata para que las páginas sean estables
+            queryset = queryset.order_by(*(queryset.query.order_by or self.model._meta.ordering), 'pk')
+            self.paginator = Paginator(queryset, self.per_page)
+            page_number = self.request.GET.get(self.page_param) if self.request else None
+            self.page = self.paginator.get_page(page_number)
+            if self.is_bound:
+                self._queryset = queryset.filter(pk__in=self._posted_pks())
+            else:
+                self._queryset = self.page.object_list
+        return self._queryset
+
+    def _construct_form(self, i, **kwargs):
+        form = super()._construct_form(i, **kwargs)
+        if self.is_bound and i < self.initial_form_count() and not form.has_changed():
+            form.empty_permitted = True
+        return form
+
+    def page_links(self):
+        query = self.request.GET.copy() if self.request else {}
+        for number in self.paginator.page_range:
+            query[self.page_param] = number
+            yield number, query.urlencode()
+
+
+class PaginatedInlineMixin:
+    '''
+    Mixin para StackedInline: pagina las filas existentes con PaginatedInlineFormSet.
+        - per_page: Filas existentes por página.
+    '''
+    per_page = 10
+    formset = PaginatedInlineFormSet
+    template = 'admin/shop/edit_inline/paginated_stacked.html'
+
+    def get_formset(self, request, obj=None, **kwargs):
+        formset = super().get_formset(request, obj, **kwargs)
+        formset.request = request
+        formset.per_page = self.per_page
+        return formset
+
 # --- CONFIGURACIÓN DE INLINES (Tablas dentro de otras tablas) ---
-class ProductImageInline(admin.StackedInline):
+class ProductImageInline(PaginatedInlineMixin, admin.StackedInline):
     model = ProductImage
     extra = 1 # Cuántos espacios vacíos mostrar por defecto
+    per_page = 12 # Imágenes existentes por página
     show_change_link = True # Permite ir a la edición completa de la imagen
     readonly_fields = ['image_preview'] # Opcional: para ver la foto cargada
 
@@ -18,12 +98,13 @@ class ProductImageInline(admin.StackedInline):
         return "No image"
     image_preview.short_description = "Vista Previa"
 
-class ProductVariantInline(admin.StackedInline):
+class ProductVariantInline(PaginatedInlineMixin, admin.StackedInline):
     model = ProductVariant
     extra = 1  # Muestra 1 fila vacía para agregar variantes rápido
+    per_page = 10 # Variantes existentes por página
     show_change_link = True # Permite ir a la edición completa de la variante
     formfield_overrides = {
-        JSONField: {'widget': JSONEditorWidget},
+        JSONField: {'widget': LazyJSONEditorWidget}, # El editor se crea al abrirlo, no por cada fila
     }
 
 # --- CONFIGURACIÓN DE LOS PANELES PRINCIPALES ---
@@ -70,11 +151,23 @@ class ProductAdmin(admin.ModelAdmin):
     inlines = [
         ProductVariantInline,
     ]
+    actions = ['activate_products', 'deactivate_products']
+
+    # Acciones en lote: pasan por set_products_active para que las variantes copien el estado del producto
+    @admin.action(description="Activar los productos seleccionados (y sus variantes)")
+    def activate_products(self, request, queryset):
+        total = set_products_active(queryset, True)
+        self.message_user(request, f"Productos activados: {total}")
+
+    @admin.action(description="Desactivar los productos seleccionados (y sus variantes)")
+    def deactivate_products(self, request, queryset):
+        total = set_products_active(queryset, False)
+        self.message_user(request, f"Productos desactivados: {total}")
 
 @admin.register(ProductVariant)
 class ProductVariantAdmin(admin.ModelAdmin):
-    list_display = ('name', 'product', 'slug', 'sku', 'brand','price', 'is_master')
-    list_filter = ('product', 'is_master', 'brand', 'created_at')
+    list_display = ('name', 'product', 'slug', 'sku', 'brand','price', 'is_master', 'is_active')
+    list_filter = ('product', 'is_master', 'is_active', 'brand', 'created_at')
     search_fields = ('name', 'description', 'product__name', 'brand__name')
     readonly_fields = ['sku','created_at', 'updated_at']
 
@@ -88,7 +181,7 @@ class ProductVariantAdmin(admin.ModelAdmin):
         ('Detalles del producto',{
             'classes': ('collapse',),
             'fields': (
-                'attributes', 'price','weight_g', 'is_master',
+                'attributes', 'price','weight_g', 'is_master', 'is_active',
             ),
         }),
         ('Fecha de Creación y Actualización', {
@@ -130,4 +223,6 @@ class ProductImageAdmin(admin.ModelAdmin):
 admin.site.site_header = "Geek Commerce Admin"
 admin.site.site_title = "Geek Commerce Admin Portal"
 admin.site.index_title = "Bienvenido al Panel de Administración de Geek Commerce"
+# Portada con los widgets de ventas (leen solo las tablas de rollups)
+admin.site.index_template = "admin/shop/index.html"
 
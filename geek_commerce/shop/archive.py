@@ -0,0 +1,45 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import (
+    ArchivedProduct, ArchivedProductImage, ArchivedProductVariant,
+    Product, ProductImage, ProductVariant,
+)
+
+PRODUCT_FIELDS = ['id', 'category_id', 'name', 'slug', 'description', 'base_specs', 'created_at', 'updated_at']
+VARIANT_FIELDS = [
+    'id', 'product_id', 'name', 'slug', 'sku', 'brand_id', 'description', 'attributes',
+    'weight_g', 'price', 'is_master', 'is_active', 'created_at', 'updated_at',
+]
+IMAGE_FIELDS = ['id', 'variant_id', 'image', 'alt_text', 'is_main', 'created_at', 'updated_at']
+
+
+def archivable_products(days):
+    '''
+    Productos inactivos que no se modifican hace al menos `days` días.
+    '''
+    return Product.objects.filter(is_active=False, updated_at__lt=timezone.now() - timedelta(days=days))
+
+
+def archive_products(product_ids):
+    '''
+    Mueve un lote de productos (con sus variantes e imágenes) a las tablas de archivo en una transacción:
+    copia las filas con bulk_create y luego borra las originales. Los archivos de imagen no se tocan.
+    Al borrar se eliminan en cascada las filas que dependen del producto (vecinos, subidas); los totales de
+    ventas por variante se conservan (VariantSales se identifica por SKU y su variante queda en NULL).
+    Devuelve la cantidad de productos archivados.
+    '''
+    with transaction.atomic():
+        products = list(Product.objects.filter(id__in=product_ids, is_active=False).values(*PRODUCT_FIELDS))
+        ids = [product['id'] for product in products]
+        variants = list(ProductVariant.objects.filter(product_id__in=ids).values(*VARIANT_FIELDS))
+        images = list(ProductImage.objects.filter(variant__product_id__in=ids).values(*IMAGE_FIELDS))
+
+        ArchivedProduct.objects.bulk_create(ArchivedProduct(**product) for product in products)
+        ArchivedProductVariant.objects.bulk_create(ArchivedProductVariant(**variant) for variant in variants)
+        ArchivedProductImage.objects.bulk_create(ArchivedProductImage(**image) for image in images)
+
+        Product.objects.filter(id__in=ids).delete()
+    return len(ids)
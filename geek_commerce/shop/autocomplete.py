@@ -0,0 +1,147 @@
+import threading
+import time
+import unicodedata
+from bisect import bisect_left
+
+from django.conf import settings
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db.models import Count, Max
+
+from .models import Brand, Category, Product
+
+
+def normalize(text):
+    '''
+    Normaliza un texto para comparar prefijos: minúsculas, sin acentos y con espacios simples.
+    Ej: "Cartuchera Pokémon " -> "cartuchera pokemon"
+    '''
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(text.lower().split())
+
+
+class PrefixCache:
+    '''
+    Caché en memoria (una por proceso) con los nombres de categorías, marcas y productos activos.
+        - Guarda un arreglo ordenado de claves normalizadas y resuelve prefijos con búsqueda binaria.
+        - Cada nombre se indexa también desde el inicio de cada palabra ("remera negra" -> "negra"),
+          así "neg" encuentra "Remera Negra".
+        - Cada AUTOCOMPLETE_REFRESH_SECONDS consulta las marcas de tiempo de las tablas y
+          solo se reconstruye si algo cambió.
+    '''
+    def __init__(self):
+        self._keys = []
+        self._entries = []
+        self._stamp = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.complete = True
+
+    def _querysets(self):
+        max_products = getattr(settings, 'AUTOCOMPLETE_MAX_PRODUCTS', 20000)
+        return (
+            ('category', Category.objects.all()),
+            ('brand', Brand.objects.all()),
+            ('product', Product.active.order_by('-updated_at')[:max_products]),
+        )
+
+    def _current_stamp(self):
+        # Una consulta por tabla; el conteo detecta borrados que no cambian el máximo de updated_at
+        return (
+            tuple(Category.objects.aggregate(Max('updated_at'), Count('id')).values()),
+            tuple(Brand.objects.aggregate(Max('updated_at'), Count('id')).values()),
+            tuple(Product.active.aggregate(Max('updated_at'), Count('id')).values()),
+        )
+
+    def _build(self):
+        pairs = []
+        for kind, queryset in self._querysets():
+            for name, slug in queryset.values_list('name', 'slug'):
+                entry = {'type': kind, 'name': name, 'slug': slug}
+                words = normalize(name).split(' ')
+                for position in range(len(words)):
+                    pairs.append((' '.join(words[position:]), position, entry))
+        pairs.sort(key=lambda pair: (pair[0], pair[1]))
+        return [pair[0] for pair in pairs], [pair[2] for pair in pairs]
+
+    def refresh(self, force=False):
+        refresh_seconds = getattr(settings, 'AUTOCOMPLETE_REFRESH_SECONDS', 60)
+        now = time.monotonic()
+        if not force and now - self._checked_at < refresh_seconds:
+            return
+        # Si otro hilo ya está refrescando, seguimos con los datos actuales
+        if not self._lock.acquire(blocking=force or self._stamp is None):
+            return
+        try:
+            self._checked_at = now
+            stamp = self._current_stamp()
+            if force or stamp != self._stamp:
+                keys, entries = self._build()
+                active_products = stamp[2][1]
+                complete = active_products <= getattr(settings, 'AUTOCOMPLETE_MAX_PRODUCTS', 20000)
+                # Reemplazo atómico de las referencias: los lectores nunca ven un estado a medias
+                self._keys, self._entries, self.complete = keys, entries, complete
+                self._stamp = stamp
+        finally:
+            self._lock.release()
+
+    def lookup(self, query, limit=10):
+        prefix = normalize(query)
+        keys, entries = self._keys, self._entries
+        results = []
+        seen = set()
+        index = bisect_left(keys, prefix)
+        while index < len(keys) and keys[index].startswith(prefix) and len(results) < limit:
+            entry = entries[index]
+            key = (entry['type'], entry['slug'])
+            if key not in seen:
+                seen.add(key)
+                results.append(entry)
+            index += 1
+        return results
+
+
+prefix_cache = PrefixCache()
+
+
+def search_database(query, limit=10):
+    '''
+    Búsqueda difusa en la base de datos con pg_trgm (operador <% sobre los índices GIN trigram).
+    Solo se usa cuando la caché de prefijos no alcanza (errores de tipeo, coincidencias en medio de palabra).
+    '''
+    results = []
+    for kind, queryset in (
+        ('category', Category.objects.all()),
+        ('brand', Brand.objects.all()),
+        ('product', Product.active.all()),
+    ):
+        matches = (
+            queryset.filter(name__trigram_word_similar=query)
+            .annotate(similarity=TrigramWordSimilarity(query, 'name'))
+            .order_by('-similarity')
+            .values_list('name', 'slug', 'similarity')[:limit]
+        )
+        results.extend(
+            (similarity, {'type': kind, 'name': name, 'slug': slug})
+            for name, slug, similarity in matches
+        )
+    results.sort(key=lambda result: result[0], reverse=True)
+    return [entry for _, entry in results[:limit]]
+
+
+def suggest(query, limit=10):
+    '''
+    Devuelve hasta `limit` sugerencias para el texto tipeado.
+    Primero busca en la caché de prefijos; solo consulta la base de datos si la caché no encontró nada
+    o si no contiene todo el catálogo y los resultados no alcanzan.
+    '''
+    prefix_cache.refresh()
+    results = prefix_cache.lookup(query, limit)
+    if not results or (not prefix_cache.complete and len(results) < limit):
+        seen = {(entry['type'], entry['slug']) for entry in results}
+        for entry in search_database(query, limit):
+            if len(results) >= limit:
+                break
+            if (entry['type'], entry['slug']) not in seen:
+                results.append(entry)
+    return results
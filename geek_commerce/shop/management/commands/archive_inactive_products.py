@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from shop.archive import archivable_products, archive_products
+
+
+class Command(BaseCommand):
+    help = (
+        "Mueve los productos inactivos hace mucho tiempo (y sus variantes e imágenes) a las tablas de archivo, "
+        "para que las tablas e índices del catálogo activo se mantengan chicos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=365, help="Días sin modificaciones para considerar un producto archivable.")
+        parser.add_argument('--batch-size', type=int, default=500, help="Productos archivados por transacción.")
+        parser.add_argument('--dry-run', action='store_true', help="Solo informa cuántos productos se archivarían.")
+
+    def handle(self, *args, **options):
+        ids = list(archivable_products(options['days']).order_by('id').values_list('id', flat=True))
+        if options['dry_run']:
+            self.stdout.write(f"Productos archivables: {len(ids)}")
+            return
+
+        total = 0
+        for start in range(0, len(ids), options['batch_size']):
+            total += archive_products(ids[start:start + options['batch_size']])
+        self.stdout.write(self.style.SUCCESS(f"Productos archivados: {total}"))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from shop.related import rebuild_related_products
+
+
+class Command(BaseCommand):
+    help = (
+        "Calcula offline los productos relacionados (tabla RelatedProduct). "
+        "Por defecto solo recalcula los productos afectados por cambios desde la última corrida; "
+        "conviene programar además una corrida periódica con --full."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--k', type=int, default=8, help="Cantidad de vecinos por producto.")
+        parser.add_argument('--chunk-size', type=int, default=500, help="Productos procesados por bloque.")
+        parser.add_argument('--full', action='store_true', help="Recalcula todo el catálogo activo.")
+
+    def handle(self, *args, **options):
+        total = rebuild_related_products(
+            k=options['k'],
+            chunk_size=options['chunk_size'],
+            full=options['full'],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Productos relacionados recalculados: {total}"))
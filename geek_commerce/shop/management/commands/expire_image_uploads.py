@@ -0,0 +1,19 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from shop.uploads import expire_uploads
+
+
+class Command(BaseCommand):
+    help = (
+        "Borra las subidas de imágenes por partes abandonadas (sin completar y sin actividad) "
+        "junto con sus archivos parciales. Pensado para correr periódicamente (cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=24, help="Horas sin actividad para considerar abandonada una subida.")
+
+    def handle(self, *args, **options):
+        total = expire_uploads(timedelta(hours=options['hours']))
+        self.stdout.write(self.style.SUCCESS(f"Subidas vencidas borradas: {total}"))
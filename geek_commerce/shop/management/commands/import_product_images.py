@@ -0,0 +1,100 @@
+import os
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+
+from shop.models import ProductImage, ProductVariant, get_upload_path
+from shop.uploads import IMAGE_EXTENSIONS, image_storage, verify_image
+
+
+def sku_from_filename(filename):
+    '''
+    Obtiene el SKU desde el nombre del archivo: "<sku>.webp" o "<sku>_<n>.webp" (varias imágenes por variante).
+    Devuelve None si el nombre no empieza con un UUID válido.
+    '''
+    stem, ext = os.path.splitext(os.path.basename(filename))
+    if ext.lower() not in IMAGE_EXTENSIONS:
+        return None
+    try:
+        return uuid.UUID(stem.split('_')[0])
+    except ValueError:
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Carga masiva de imágenes desde un directorio o un .zip. Cada archivo se asocia a la variante "
+        "cuyo SKU coincide con el nombre (<sku>.webp o <sku>_2.webp) y se copia al storage en paralelo."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help="Directorio o archivo .zip con las imágenes.")
+        parser.add_argument('--workers', type=int, default=8, help="Copias en paralelo.")
+
+    def handle(self, *args, **options):
+        source = options['source']
+        is_zip = zipfile.is_zipfile(source)
+        if is_zip:
+            with zipfile.ZipFile(source) as archive:
+                names = [info.filename for info in archive.infolist() if not info.is_dir()]
+        elif os.path.isdir(source):
+            names = sorted(
+                os.path.relpath(os.path.join(root, filename), source)
+                for root, _, filenames in os.walk(source)
+                for filename in filenames
+            )
+        else:
+            raise CommandError(f"{source} no es un directorio ni un .zip")
+
+        files = [(name, sku_from_filename(name)) for name in names]
+        files = [(name, sku) for name, sku in files if sku]
+
+        # Una consulta para todas las variantes y otra para saber cuáles ya tienen imagen principal
+        variants = ProductVariant.objects.select_related('product').in_bulk(
+            {sku for _, sku in files}, field_name='sku'
+        )
+        with_main = set(
+            ProductImage.objects.filter(variant__in=variants.values(), is_main=True)
+            .values_list('variant_id', flat=True)
+        )
+        jobs = [(name, variants[sku]) for name, sku in sorted(files) if sku in variants]
+
+        storage = image_storage()
+
+        def copy(job):
+            name, variant = job
+            target = get_upload_path(ProductImage(variant=variant), name)
+            # storage.save copia el archivo de a bloques, sin cargarlo entero en memoria
+            if is_zip:
+                with zipfile.ZipFile(source) as archive, archive.open(name) as member:
+                    stored_name = storage.save(target, File(member, name=name))
+            else:
+                with open(os.path.join(source, name), 'rb') as handle:
+                    stored_name = storage.save(target, File(handle, name=name))
+            # bulk_create no pasa por la validación de ImageField: se verifica el contenido con Pillow
+            if not verify_image(storage, stored_name):
+                storage.delete(stored_name)
+                return name, variant, None
+            return name, variant, stored_name
+
+        images = []
+        rejected = []
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            for name, variant, stored_name in executor.map(copy, jobs):
+                if stored_name is None:
+                    rejected.append(name)
+                    continue
+                image = ProductImage(variant=variant, is_main=variant.pk not in with_main)
+                image.image.name = stored_name
+                with_main.add(variant.pk)
+                images.append(image)
+
+        ProductImage.objects.bulk_create(images, batch_size=500)
+        for name in rejected:
+            self.stderr.write(f"No es una imagen válida: {name}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imágenes cargadas: {len(images)} (sin variante: {len(names) - len(jobs)}, inválidas: {len(rejected)})"
+        ))
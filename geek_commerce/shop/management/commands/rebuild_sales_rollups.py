@@ -0,0 +1,69 @@
+import csv
+import uuid
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from shop.models import ArchivedProductVariant, ProductVariant
+from shop.rollups import apply_sales, reset_sales_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Carga (backfill) o reconstruye los rollups de ventas del panel de administración "
+        "a partir de un CSV de líneas de pedido con columnas: sku, quantity, amount, sold_at."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path', nargs='?', help="CSV con las líneas de pedido históricas.")
+        parser.add_argument('--reset', action='store_true', help="Vacía los rollups antes de cargar (reconstrucción completa).")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Líneas procesadas por lote.")
+
+    def handle(self, *args, **options):
+        if not options['csv_path'] and not options['reset']:
+            raise CommandError("Indicá un CSV para cargar o --reset para vaciar los rollups.")
+
+        if options['reset']:
+            reset_sales_rollups()
+            self.stdout.write("Rollups de ventas vaciados.")
+
+        if not options['csv_path']:
+            return
+
+        total = 0
+        skipped = 0
+        with open(options['csv_path'], newline='', encoding='utf-8') as handle:
+            batch = []
+            for line in csv.DictReader(handle):
+                batch.append(line)
+                if len(batch) >= options['batch_size']:
+                    loaded, missing = self._load_batch(batch)
+                    total, skipped = total + loaded, skipped + missing
+                    batch = []
+            if batch:
+                loaded, missing = self._load_batch(batch)
+                total, skipped = total + loaded, skipped + missing
+
+        self.stdout.write(self.style.SUCCESS(f"Líneas cargadas: {total} (SKU desconocido: {skipped})"))
+
+    def _load_batch(self, batch):
+        # Una consulta por lote para traducir SKU -> id de variante (y otra para las variantes archivadas)
+        skus = {uuid.UUID(line['sku']) for line in batch}
+        variant_ids = dict(ProductVariant.objects.filter(sku__in=skus).values_list('sku', 'id'))
+        missing = skus - variant_ids.keys()
+        if missing:
+            variant_ids.update(ArchivedProductVariant.objects.filter(sku__in=missing).values_list('sku', 'id'))
+
+        rows = []
+        for line in batch:
+            variant_id = variant_ids.get(uuid.UUID(line['sku']))
+            if variant_id is None:
+                continue
+            sold_at = datetime.fromisoformat(line['sold_at'])
+            if timezone.is_naive(sold_at):
+                sold_at = timezone.make_aware(sold_at)
+            rows.append((variant_id, timezone.localdate(sold_at), int(line['quantity']), line['amount']))
+
+        apply_sales(rows)
+        return len(rows), len(batch) - len(rows)
@@ -0,0 +1,35 @@
+# Generated by Django 6.0.1 on 2026-10-18 10:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0003_alter_brand_name_alter_category_name_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='related_computed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Relacionados calculados el'),
+        ),
+        migrations.CreateModel(
+            name='RelatedProduct',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField(verbose_name='Posición')),
+                ('score', models.FloatField(verbose_name='Similitud')),
+                ('computed_at', models.DateTimeField(verbose_name='Calculado el')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_links', to='shop.product', verbose_name='Producto')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='shop.product', verbose_name='Producto Relacionado')),
+            ],
+            options={
+                'verbose_name_plural': 'Productos Relacionados',
+                'ordering': ['product', 'rank'],
+                'constraints': [models.UniqueConstraint(fields=('product', 'rank'), name='shop_relatedproduct_product_rank_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 6.0.1 on 2026-10-18 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0005_brand_updated_at_category_updated_at_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BrandSalesDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Día')),
+                ('units', models.PositiveIntegerField(default=0, verbose_name='Unidades')),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Importe')),
+                ('brand', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='shop.brand', verbose_name='Marca')),
+            ],
+            options={
+                'verbose_name_plural': 'Ventas diarias por marca',
+                'indexes': [models.Index(fields=['day'], name='shop_brands_day_5b052d_idx')],
+                'constraints': [models.UniqueConstraint(fields=('brand', 'day'), name='shop_brandsalesdaily_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='CategorySalesDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Día')),
+                ('units', models.PositiveIntegerField(default=0, verbose_name='Unidades')),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Importe')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='shop.category', verbose_name='Categoría')),
+            ],
+            options={
+                'verbose_name_plural': 'Ventas diarias por categoría',
+                'indexes': [models.Index(fields=['day'], name='shop_catego_day_4e7bb7_idx')],
+                'constraints': [models.UniqueConstraint(fields=('category', 'day'), name='shop_categorysalesdaily_uniq')],
+            },
+        ),
+        migrations.CreateModel(
+            name='VariantSales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('units', models.PositiveIntegerField(default=0, verbose_name='Unidades')),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Importe')),
+                ('variant', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='sales', to='shop.productvariant', verbose_name='Variante')),
+            ],
+            options={
+                'verbose_name_plural': 'Ventas por variante',
+                'indexes': [models.Index(fields=['-units'], name='shop_variantsales_units_idx')],
+            },
+        ),
+    ]
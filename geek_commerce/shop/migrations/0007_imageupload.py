@@ -0,0 +1,36 @@
+# Generated by Django 6.0.1 on 2026-10-18 13:00
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0006_brandsalesdaily_categorysalesdaily_variantsales'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('filename', models.CharField(max_length=255, verbose_name='Archivo original')),
+                ('path', models.CharField(max_length=500, verbose_name='Ruta en el storage')),
+                ('size', models.PositiveBigIntegerField(verbose_name='Tamaño (bytes)')),
+                ('checksum', models.CharField(max_length=64, verbose_name='SHA-256')),
+                ('received', models.PositiveBigIntegerField(default=0, verbose_name='Bytes recibidos')),
+                ('alt_text', models.CharField(blank=True, max_length=300, verbose_name='Texto Alternativo (SEO)')),
+                ('is_main', models.BooleanField(default=False, verbose_name='¿Es la principal?')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('image', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='upload', to='shop.productimage', verbose_name='Imagen')),
+                ('variant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='uploads', to='shop.productvariant', verbose_name='Variante')),
+            ],
+            options={
+                'verbose_name': 'Subida de Imagen',
+                'verbose_name_plural': 'Subidas de Imágenes',
+            },
+        ),
+    ]
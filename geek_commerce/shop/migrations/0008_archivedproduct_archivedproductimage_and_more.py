@@ -0,0 +1,117 @@
+# Generated by Django 6.0.1 on 2026-10-18 14:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0007_imageupload'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedProduct',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=300, verbose_name='Nombre')),
+                ('slug', models.SlugField()),
+                ('description', models.TextField(verbose_name='Descripción')),
+                ('base_specs', models.JSONField(blank=True, default=dict, null=True, verbose_name='Especificaciones Base')),
+                ('created_at', models.DateTimeField(verbose_name='Creado el')),
+                ('updated_at', models.DateTimeField(verbose_name='Actualizado el')),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='Archivado el')),
+            ],
+            options={
+                'verbose_name_plural': 'Productos Archivados',
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedProductImage',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('image', models.CharField(max_length=500, verbose_name='Imagen')),
+                ('alt_text', models.CharField(blank=True, max_length=300, verbose_name='Texto Alternativo (SEO)')),
+                ('is_main', models.BooleanField(default=False, verbose_name='¿Es la principal?')),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Imagen Archivada',
+                'verbose_name_plural': 'Imágenes Archivadas',
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedProductVariant',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=300, verbose_name='Nombre de la Variante')),
+                ('slug', models.SlugField()),
+                ('sku', models.UUIDField(verbose_name='SKU (Código único de inventario)')),
+                ('description', models.TextField(blank=True, verbose_name='Descripción de la Variante')),
+                ('attributes', models.JSONField(blank=True, default=dict, null=True, verbose_name='Atributos Específicos (ej: color, talla)')),
+                ('weight_g', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True, verbose_name='Peso en gramos')),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Precio Base')),
+                ('is_master', models.BooleanField(default=False, verbose_name='¿Es la Variante del producto Principal?')),
+                ('created_at', models.DateTimeField(verbose_name='Creado el')),
+                ('updated_at', models.DateTimeField(verbose_name='Actualizado el')),
+            ],
+            options={
+                'verbose_name_plural': 'Variantes Archivadas',
+            },
+        ),
+        migrations.AddField(
+            model_name='productvariant',
+            name='is_active',
+            field=models.BooleanField(default=True, verbose_name='¿Activa?'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['name'], name='shop_product_active_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['category', 'name'], name='shop_product_active_cat_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at'], name='shop_product_active_new_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productvariant',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['product', 'price'], name='shop_variant_active_prod_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productvariant',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['name'], name='shop_variant_active_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productvariant',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['price'], name='shop_variant_active_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productvariant',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at'], name='shop_variant_active_new_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedproduct',
+            name='category',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='shop.category', verbose_name='Categoría'),
+        ),
+        migrations.AddField(
+            model_name='archivedproductvariant',
+            name='brand',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='shop.brand', verbose_name='Marca'),
+        ),
+        migrations.AddField(
+            model_name='archivedproductvariant',
+            name='product',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='variants', to='shop.archivedproduct', verbose_name='Producto'),
+        ),
+        migrations.AddField(
+            model_name='archivedproductimage',
+            name='variant',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='images', to='shop.archivedproductvariant', verbose_name='Variante'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 6.0.1 on 2026-10-18 15:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0008_archivedproduct_archivedproductimage_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlugHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=100, verbose_name='Modelo')),
+                ('slug', models.SlugField(db_index=False, verbose_name='Slug anterior')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='Id del objeto')),
+                ('target_slug', models.SlugField(db_index=False, verbose_name='Slug actual')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Slug Histórico',
+                'verbose_name_plural': 'Historial de Slugs',
+                'indexes': [models.Index(fields=['model', 'object_id'], name='shop_slughi_model_707972_idx')],
+                'constraints': [models.UniqueConstraint(fields=('model', 'slug'), name='shop_slughistory_model_slug_uniq')],
+            },
+        ),
+    ]
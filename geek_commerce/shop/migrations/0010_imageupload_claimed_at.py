@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-18 17:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0009_slughistory'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imageupload',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Chunk en curso desde'),
+        ),
+    ]
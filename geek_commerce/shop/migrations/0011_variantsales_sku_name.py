@@ -0,0 +1,44 @@
+# Generated by Django 6.0.1 on 2026-10-18 17:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_sku_and_name(apps, schema_editor):
+    VariantSales = apps.get_model('shop', 'VariantSales')
+    rows = VariantSales.objects.select_related('variant__product')
+    for sales in rows:
+        sales.sku = sales.variant.sku
+        sales.name = f"{sales.variant.product.name} - {sales.variant.name}"[:600]
+    VariantSales.objects.bulk_update(rows, ['sku', 'name'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0010_imageupload_claimed_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='variantsales',
+            name='sku',
+            field=models.UUIDField(null=True, verbose_name='SKU'),
+        ),
+        migrations.AddField(
+            model_name='variantsales',
+            name='name',
+            field=models.CharField(blank=True, max_length=600, verbose_name='Nombre'),
+        ),
+        migrations.RunPython(fill_sku_and_name, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='variantsales',
+            name='sku',
+            field=models.UUIDField(unique=True, verbose_name='SKU'),
+        ),
+        migrations.AlterField(
+            model_name='variantsales',
+            name='variant',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sales', to='shop.productvariant', verbose_name='Variante'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.1 on 2026-10-18 18:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0011_variantsales_sku_name'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='slughistory',
+            index=models.Index(fields=['model', 'slug'], name='shop_slughistory_slug_like', opclasses=['varchar_pattern_ops', 'varchar_pattern_ops']),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 6.0.1 on 2026-10-18 23:30
+
+from django.db import migrations, models
+
+
+def deactivate_variants_of_inactive_products(apps, schema_editor):
+    # Las variantes de productos inactivos quedaban activas (y dentro de los índices parciales)
+    ProductVariant = apps.get_model('shop', 'ProductVariant')
+    ProductVariant.objects.filter(product__is_active=False, is_active=True).update(is_active=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('shop', '0012_slughistory_slug_like'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedproductvariant',
+            name='is_active',
+            field=models.BooleanField(default=False, verbose_name='¿Activa?'),
+        ),
+        migrations.RunPython(deactivate_variants_of_inactive_products, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,12 @@
 import uuid
 import os
 
-from django.db import models
+from django.db import models, transaction
+from django.contrib.postgres.indexes import GinIndex
 from django.conf import settings
 from django.utils import timezone
-from django.utils.text import slugify
+
+from .slugs import save_with_slug
 
 # Create your models here.
 class Category(models.Model):
@@ -13,29 +15,34 @@ class Category(models.Model):
         - name: Nombre de la categoría.
         - slug: Slug único para URLs amigables.
         - parent: Relación opcional a sí misma para permitir subcategorías.
+        - updated_at: Fecha de la última modificación (la usa la caché del autocompletado).
         - Meta:
             - ordering: Ordena por nombre al recuperar categorías.
-            - indexes: Índice en el campo 'name' para búsquedas rápidas.
+            - indexes: Índice en el campo 'name' para búsquedas rápidas y GIN trigram para el autocompletado.
             - verbose_name_plural: Nombre plural para la administración de Django.
-        - save: Sobrescribe el método save para generar automáticamente el slug a partir del nombre si no se proporciona.
+        - save: Sobrescribe el método save para asignar un slug único a partir del nombre (con sufijo si ya existe) y, si el nombre cambia, renovarlo guardando el anterior en SlugHistory.
+        - get_slug_source: Texto a partir del cual se genera el slug.
         - __str__: Devuelve el nombre de la categoría como representación de cadena.
 
     '''
     name = models.CharField(max_length=200, verbose_name="Nombre")
     slug = models.SlugField(unique=True, blank=True)
     parent = models.ForeignKey('self', null=True, blank=True, related_name='children', on_delete=models.SET_NULL, verbose_name="Categoría Padre")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Actualizado el")
 
     class Meta:
         ordering = ['name']
         indexes = [
             models.Index(fields=['name']),
+            GinIndex(fields=['name'], opclasses=['gin_trgm_ops'], name='shop_category_name_trgm'),
         ]
         verbose_name_plural = "Categorías"
 
+    def get_slug_source(self):
+        return self.name
+
     def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
+        save_with_slug(self, super().save, *args, **kwargs)
 
     def __str__(self):
         return self.name
@@ -46,32 +53,56 @@ class Brand(models.Model):
     Modelo para marcas de productos.
         - name: Nombre de la marca.
         - slug: Slug único para URLs amigables.
+        - updated_at: Fecha de la última modificación (la usa la caché del autocompletado).
         - Meta:
             - ordering: Ordena por nombre al recuperar marcas.
-            - indexes: Índice en el campo 'name' para búsquedas rápidas.
+            - indexes: Índice en el campo 'name' para búsquedas rápidas y GIN trigram para el autocompletado.
             - verbose_name_plural: Nombre plural para la administración de Django.
-        - save: Sobrescribe el método save para generar automáticamente el slug a partir del nombre si no se proporciona.
+        - save: Sobrescribe el método save para asignar un slug único a partir del nombre (con sufijo si ya existe) y, si el nombre cambia, renovarlo guardando el anterior en SlugHistory.
+        - get_slug_source: Texto a partir del cual se genera el slug.
         - __str__: Devuelve el nombre de la marca como representación de cadena.
     '''
     name = models.CharField(max_length=200, verbose_name="Nombre de la Marca")
     slug = models.SlugField(unique=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Actualizado el")
 
     class Meta:
         ordering = ['name']
         indexes = [
             models.Index(fields=['name']),
+            GinIndex(fields=['name'], opclasses=['gin_trgm_ops'], name='shop_brand_name_trgm'),
         ]
         verbose_name_plural = "Marcas"
 
+    def get_slug_source(self):
+        return self.name
+
     def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
+        save_with_slug(self, super().save, *args, **kwargs)
 
     def __str__(self):
         return self.name
 
 
+# CATÁLOGO ACTIVO (hot)
+class ActiveProductManager(models.Manager):
+    '''
+    Manager del catálogo activo: solo productos con is_active=True.
+    El filtro coincide con la condición de los índices parciales de Product, así el planificador
+    puede usar esos índices (más chicos, sin las filas inactivas).
+    '''
+    def get_queryset(self):
+        return super().get_queryset().filter(is_active=True)
+
+
+class ActiveVariantManager(models.Manager):
+    '''
+    Manager de variantes vendibles: variante activa y producto padre activo.
+    '''
+    def get_queryset(self):
+        return super().get_queryset().filter(is_active=True, product__is_active=True)
+
+
 # PRODUCTOS (padre)
 class Product(models.Model):
     '''
@@ -82,11 +113,17 @@ class Product(models.Model):
         - description: Descripción detallada del producto.
         - base_specs: Campo JSON para almacenar especificaciones base del producto (ej: material, dimensiones).
         - is_active: Indica si el producto está activo y disponible para la venta.
+        - related_computed_at: Fecha del último cálculo de productos relacionados (lo actualiza el comando build_related_products).
+        - objects / active: Manager por defecto y manager del catálogo activo (is_active=True).
         - Meta:
             - ordering: Ordena por nombre al recuperar productos.
-            - indexes: Índices en los campos 'name', 'category' y 'created_at' para búsquedas rápidas.
+            - indexes: Índices en los campos 'name', 'category' y 'created_at' para búsquedas rápidas, y GIN trigram en 'name' para el autocompletado.
+              Además, índices parciales (solo filas activas) para las consultas de la tienda.
             - verbose_name_plural: Nombre plural para la administración de Django.
-        - save: Sobrescribe el método save para generar automáticamente el slug a partir del nombre si no se proporciona.
+        - save: Sobrescribe el método save para asignar un slug único a partir del nombre (con sufijo si ya existe) y, si el nombre cambia, renovarlo guardando el anterior en SlugHistory.
+          Si cambia is_active, copia el valor a todas sus variantes (ver set_products_active).
+        - get_slug_source: Texto a partir del cual se genera el slug.
+        - get_related_products: Devuelve los productos relacionados precalculados ("también te puede interesar").
         - __str__: Devuelve el nombre del producto como representación de cadena.
     '''
     category = models.ForeignKey(Category, related_name='products', on_delete=models.PROTECT, verbose_name="Categoría")
@@ -98,6 +135,10 @@ class Product(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Creado el")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Actualizado el")
+    related_computed_at = models.DateTimeField(null=True, blank=True, editable=False, verbose_name="Relacionados calculados el")
+
+    objects = models.Manager()
+    active = ActiveProductManager()
 
     class Meta:
         ordering = ['name']
@@ -105,18 +146,88 @@ class Product(models.Model):
             models.Index(fields=['name']),
             models.Index(fields=['category']),
             models.Index(fields=['created_at']),
+            GinIndex(fields=['name'], opclasses=['gin_trgm_ops'], name='shop_product_name_trgm'),
+            # Índices parciales del catálogo activo
+            models.Index(fields=['name'], condition=models.Q(is_active=True), name='shop_product_active_name_idx'),
+            models.Index(fields=['category', 'name'], condition=models.Q(is_active=True), name='shop_product_active_cat_idx'),
+            models.Index(fields=['-created_at'], condition=models.Q(is_active=True), name='shop_product_active_new_idx'),
         ]
         verbose_name_plural = "Productos"
 
+    def get_slug_source(self):
+        return self.name
+
     def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.name)
-        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        sync_variants = self.pk is not None and (update_fields is None or 'is_active' in update_fields)
+        with transaction.atomic():
+            if sync_variants:
+                was_active = Product.objects.filter(pk=self.pk).values_list('is_active', flat=True).first()
+                sync_variants = was_active is not None and was_active != self.is_active
+            save_with_slug(self, super().save, *args, **kwargs)
+            if sync_variants:
+                self.variants.update(is_active=self.is_active, updated_at=timezone.now())
+
+    def get_related_products(self, limit=8):
+        # Una sola consulta sobre el índice único (product, rank) de la tabla de vecinos.
+        links = (
+            RelatedProduct.objects
+            .filter(product=self, related__is_active=True)
+            .select_related('related')
+            .order_by('rank')[:limit]
+        )
+        return [link.related for link in links]
 
     def __str__(self):
         return self.name
 
 
+class RelatedProduct(models.Model):
+    '''
+    Tabla de vecinos precalculada para las sugerencias "también te puede interesar".
+    Se llena de forma offline con el comando build_related_products, nunca durante una vista.
+        - product: Producto para el cual se calcularon las sugerencias.
+        - related: Producto sugerido.
+        - rank: Posición de la sugerencia (0 = la más similar).
+        - score: Similitud coseno entre ambos productos.
+        - computed_at: Momento en que se calculó la fila.
+        - Meta:
+            - ordering: Ordena por producto y posición.
+            - constraints: Restricción única (product, rank), que además sirve de índice para la lectura.
+            - verbose_name_plural: Nombre plural para la administración de Django.
+    '''
+    product = models.ForeignKey(Product, related_name='related_links', on_delete=models.CASCADE, verbose_name="Producto")
+    related = models.ForeignKey(Product, related_name='+', on_delete=models.CASCADE, verbose_name="Producto Relacionado")
+    rank = models.PositiveSmallIntegerField(verbose_name="Posición")
+    score = models.FloatField(verbose_name="Similitud")
+    computed_at = models.DateTimeField(verbose_name="Calculado el")
+
+    class Meta:
+        ordering = ['product', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'rank'], name='shop_relatedproduct_product_rank_uniq'),
+        ]
+        verbose_name_plural = "Productos Relacionados"
+
+    def __str__(self):
+        return f"{self.product_id} -> {self.related_id} ({self.rank})"
+
+
+def set_products_active(products, active):
+    '''
+    Activa o desactiva un lote de productos (queryset o lista de ids) junto con sus variantes, en una transacción.
+    Es el equivalente en lote de cambiar is_active y llamar a save(): queryset.update() no pasa por save(),
+    y sin copiar el valor las variantes de un producto inactivo seguirían en los índices parciales del catálogo activo.
+    Devuelve la cantidad de productos actualizados.
+    '''
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(Product.objects.filter(pk__in=products).exclude(is_active=active).values_list('pk', flat=True))
+        Product.objects.filter(pk__in=ids).update(is_active=active, updated_at=now)
+        ProductVariant.objects.filter(product_id__in=ids).update(is_active=active, updated_at=now)
+    return len(ids)
+
+
 class ProductVariant(models.Model):
     '''
     Modelo para variantes de productos. Cada variante representa una versión específica de un producto (ej: un producto "Camiseta" puede tener variantes "Camiseta Roja - Talla M", "Camiseta Azul - Talla L", etc.).
@@ -130,11 +241,16 @@ class ProductVariant(models.Model):
         - weight_g: Peso de la variante en gramos.
         - price: Precio base de la variante.
         - is_master: Indica si esta variante es la principal del producto (la que se muestra por defecto).
+        - is_active: Indica si la variante está a la venta (además de que lo esté su producto). Se copia del producto
+          cuando este se activa o desactiva, y una variante nueva de un producto inactivo nace inactiva.
+        - objects / active: Manager por defecto y manager de variantes vendibles (variante y producto activos).
         - Meta:
             - ordering: Ordena por nombre al recuperar variantes.
             - indexes: Índices en los campos 'name', 'slug', 'sku', 'product', 'brand' y 'created_at' para búsquedas rápidas.
+              Además, índices parciales (solo variantes activas) por producto y precio, nombre, precio y fecha de creación.
             - verbose_name_plural: Nombre plural para la administración de Django.
-        - save: Sobrescribe el método save para generar automáticamente el slug a partir del nombre si no se proporciona.
+        - save: Sobrescribe el método save para asignar un slug único a partir del nombre (con sufijo si ya existe) y, si el nombre cambia, renovarlo guardando el anterior en SlugHistory.
+        - get_slug_source: Texto a partir del cual se genera el slug.
         - __str__: Devuelve una representación de cadena que indica el nombre del producto y el nombre de la variante.
     '''
     product = models.ForeignKey(Product, related_name='variants', on_delete=models.CASCADE, verbose_name="Producto")
@@ -147,9 +263,13 @@ class ProductVariant(models.Model):
     weight_g = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="Peso en gramos")
     price = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="Precio Base")
     is_master = models.BooleanField(default=False, verbose_name="¿Es la Variante del producto Principal?")
+    is_active = models.BooleanField(default=True, verbose_name="¿Activa?")
 
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Creado el")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Actualizado el")
+
+    objects = models.Manager()
+    active = ActiveVariantManager()
     
     class Meta:
         ordering = ['name']
@@ -159,13 +279,21 @@ class ProductVariant(models.Model):
             models.Index(fields=['product']),
             models.Index(fields=['brand']),
             models.Index(fields=['created_at']),
+            # Índices parciales del catálogo activo
+            models.Index(fields=['product', 'price'], condition=models.Q(is_active=True), name='shop_variant_active_prod_idx'),
+            models.Index(fields=['name'], condition=models.Q(is_active=True), name='shop_variant_active_name_idx'),
+            models.Index(fields=['price'], condition=models.Q(is_active=True), name='shop_variant_active_price_idx'),
+            models.Index(fields=['-created_at'], condition=models.Q(is_active=True), name='shop_variant_active_new_idx'),
         ]
         verbose_name_plural = "Variantes de Producto"
 
+    def get_slug_source(self):
+        return f"{self.product.slug} {self.name}"
+
     def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(f"{self.product.slug} {self.name}")
-        super().save(*args, **kwargs)
+        if self._state.adding and not self.product.is_active:
+            self.is_active = False
+        save_with_slug(self, super().save, *args, **kwargs)
 
     def __str__(self):
         return f"{self.product.name} - {self.name}"
@@ -222,3 +350,248 @@ class ProductImage(models.Model):
     
     def __str__(self):
         return f"Imagen {self.id} de {self.variant.sku}"
+
+
+class ImageUpload(models.Model):
+    '''
+    Sesión de subida por partes (chunked) de una imagen de variante. Permite reanudar subidas cortadas.
+    Los bytes se escriben directamente en la ubicación final (path) a medida que llegan; al completar
+    la subida se verifica el checksum y recién entonces se crea el ProductImage.
+        - id: Identificador de la sesión (UUID, se usa en las URLs).
+        - variant: Variante a la que pertenecerá la imagen.
+        - filename: Nombre original del archivo.
+        - path: Nombre del archivo en el storage (generado con get_upload_path).
+        - size: Tamaño total esperado en bytes.
+        - checksum: SHA-256 (hex) esperado del archivo completo.
+        - received: Bytes recibidos hasta el momento (offset desde donde reanudar).
+        - claimed_at: Momento en que un request tomó la sesión para escribir un chunk (None si está libre).
+        - alt_text / is_main: Datos que se copian al ProductImage creado.
+        - image: ProductImage creado al completar la subida.
+    '''
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    variant = models.ForeignKey(ProductVariant, related_name='uploads', on_delete=models.CASCADE, verbose_name="Variante")
+    filename = models.CharField(max_length=255, verbose_name="Archivo original")
+    path = models.CharField(max_length=500, verbose_name="Ruta en el storage")
+    size = models.PositiveBigIntegerField(verbose_name="Tamaño (bytes)")
+    checksum = models.CharField(max_length=64, verbose_name="SHA-256")
+    received = models.PositiveBigIntegerField(default=0, verbose_name="Bytes recibidos")
+    claimed_at = models.DateTimeField(null=True, blank=True, verbose_name="Chunk en curso desde")
+    alt_text = models.CharField(max_length=300, blank=True, verbose_name="Texto Alternativo (SEO)")
+    is_main = models.BooleanField(default=False, verbose_name="¿Es la principal?")
+    image = models.OneToOneField(ProductImage, null=True, blank=True, related_name='upload', on_delete=models.SET_NULL, verbose_name="Imagen")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Subida de Imagen"
+        verbose_name_plural = "Subidas de Imágenes"
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size})"
+
+
+# HISTORIAL DE SLUGS
+class SlugHistory(models.Model):
+    '''
+    Slugs anteriores de categorías, marcas, productos y variantes, para redirigir (301) las URLs viejas.
+        - model: Modelo dueño del slug (ej: "shop.product").
+        - slug: Slug anterior.
+        - object_id: Id del objeto al que pertenecía.
+        - target_slug: Slug actual del objeto (se mantiene al día en cada renombre, así no hay cadenas de redirecciones).
+        - Meta:
+            - constraints: Restricción única (model, slug), que es también el índice de la búsqueda de redirecciones.
+            - indexes: Índice en (model, object_id) para actualizar el historial de un objeto, e índice
+              (model, slug) con varchar_pattern_ops para los slug__startswith (LIKE 'x%') de la asignación de slugs.
+    '''
+    model = models.CharField(max_length=100, verbose_name="Modelo")
+    slug = models.SlugField(db_index=False, verbose_name="Slug anterior")
+    object_id = models.PositiveBigIntegerField(verbose_name="Id del objeto")
+    target_slug = models.SlugField(db_index=False, verbose_name="Slug actual")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['model', 'slug'], name='shop_slughistory_model_slug_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['model', 'object_id']),
+            models.Index(
+                fields=['model', 'slug'],
+                name='shop_slughistory_slug_like',
+                opclasses=['varchar_pattern_ops', 'varchar_pattern_ops'],
+            ),
+        ]
+        verbose_name = "Slug Histórico"
+        verbose_name_plural = "Historial de Slugs"
+
+    def __str__(self):
+        return f"{self.model}: {self.slug} -> {self.target_slug}"
+
+
+# ARCHIVO (catálogo histórico, cold)
+class ArchivedProduct(models.Model):
+    '''
+    Copia de un producto inactivo hace tiempo, movido fuera de la tabla Product por el comando
+    archive_inactive_products. Conserva el id original para poder rastrearlo.
+        - id: Id original del producto.
+        - category: Categoría que tenía (se conserva aunque la categoría luego se borre, como NULL).
+        - name, slug, description, base_specs, created_at, updated_at: Copia de los datos del producto.
+        - archived_at: Momento en que se archivó.
+    '''
+    id = models.BigIntegerField(primary_key=True)
+    category = models.ForeignKey(Category, null=True, related_name='+', on_delete=models.SET_NULL, verbose_name="Categoría")
+    name = models.CharField(max_length=300, verbose_name="Nombre")
+    slug = models.SlugField()
+    description = models.TextField(verbose_name="Descripción")
+    base_specs = models.JSONField(default=dict, blank=True, null=True, verbose_name="Especificaciones Base")
+    created_at = models.DateTimeField(verbose_name="Creado el")
+    updated_at = models.DateTimeField(verbose_name="Actualizado el")
+    archived_at = models.DateTimeField(auto_now_add=True, verbose_name="Archivado el")
+
+    class Meta:
+        verbose_name_plural = "Productos Archivados"
+
+    def __str__(self):
+        return self.name
+
+
+class ArchivedProductVariant(models.Model):
+    '''
+    Copia de una variante de un producto archivado.
+        - id: Id original de la variante.
+        - product: Producto archivado al que pertenece.
+        - Resto de los campos: copia de ProductVariant.
+    '''
+    id = models.BigIntegerField(primary_key=True)
+    product = models.ForeignKey(ArchivedProduct, related_name='variants', on_delete=models.CASCADE, verbose_name="Producto")
+    name = models.CharField(max_length=300, verbose_name="Nombre de la Variante")
+    slug = models.SlugField()
+    sku = models.UUIDField(verbose_name="SKU (Código único de inventario)")
+    brand = models.ForeignKey(Brand, null=True, related_name='+', on_delete=models.SET_NULL, verbose_name="Marca")
+    description = models.TextField(blank=True, verbose_name="Descripción de la Variante")
+    attributes = models.JSONField(default=dict, blank=True, null=True, verbose_name="Atributos Específicos (ej: color, talla)")
+    weight_g = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="Peso en gramos")
+    price = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="Precio Base")
+    is_master = models.BooleanField(default=False, verbose_name="¿Es la Variante del producto Principal?")
+    is_active = models.BooleanField(default=False, verbose_name="¿Activa?")
+    created_at = models.DateTimeField(verbose_name="Creado el")
+    updated_at = models.DateTimeField(verbose_name="Actualizado el")
+
+    class Meta:
+        verbose_name_plural = "Variantes Archivadas"
+
+    def __str__(self):
+        return f"{self.product.name} - {self.name}"
+
+
+class ArchivedProductImage(models.Model):
+    '''
+    Copia de una imagen de una variante archivada. El archivo queda en el storage; solo se guarda su ruta.
+        - id: Id original de la imagen.
+        - variant: Variante archivada a la que pertenece.
+        - image: Ruta del archivo en el storage.
+        - alt_text, is_main, created_at, updated_at: Copia de ProductImage.
+    '''
+    id = models.BigIntegerField(primary_key=True)
+    variant = models.ForeignKey(ArchivedProductVariant, related_name='images', on_delete=models.CASCADE, verbose_name="Variante")
+    image = models.CharField(max_length=500, verbose_name="Imagen")
+    alt_text = models.CharField(max_length=300, blank=True, verbose_name="Texto Alternativo (SEO)")
+    is_main = models.BooleanField(default=False, verbose_name="¿Es la principal?")
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Imagen Archivada"
+        verbose_name_plural = "Imágenes Archivadas"
+
+    def __str__(self):
+        return self.image
+
+
+# RESÚMENES DE VENTAS (rollups para el panel de administración)
+class CategorySalesDaily(models.Model):
+    '''
+    Resumen de ventas por categoría y día. Se actualiza de forma incremental al registrar cada pedido
+    (ver shop.rollups.record_sale_lines), así el panel nunca recorre las líneas de pedido.
+        - category: Categoría del producto vendido.
+        - day: Día de la venta.
+        - units: Unidades vendidas.
+        - revenue: Importe total vendido.
+        - Meta:
+            - constraints: Una sola fila por (categoría, día).
+            - indexes: Índice en 'day' para los filtros por rango de fechas.
+    '''
+    category = models.ForeignKey(Category, related_name='daily_sales', on_delete=models.CASCADE, verbose_name="Categoría")
+    day = models.DateField(verbose_name="Día")
+    units = models.PositiveIntegerField(default=0, verbose_name="Unidades")
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0, verbose_name="Importe")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['category', 'day'], name='shop_categorysalesdaily_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['day']),
+        ]
+        verbose_name_plural = "Ventas diarias por categoría"
+
+    def __str__(self):
+        return f"{self.category_id} {self.day}"
+
+
+class BrandSalesDaily(models.Model):
+    '''
+    Resumen de ventas por marca y día (las variantes sin marca no se acumulan aquí).
+        - brand: Marca de la variante vendida.
+        - day: Día de la venta.
+        - units: Unidades vendidas.
+        - revenue: Importe total vendido.
+        - Meta:
+            - constraints: Una sola fila por (marca, día).
+            - indexes: Índice en 'day' para los filtros por rango de fechas.
+    '''
+    brand = models.ForeignKey(Brand, related_name='daily_sales', on_delete=models.CASCADE, verbose_name="Marca")
+    day = models.DateField(verbose_name="Día")
+    units = models.PositiveIntegerField(default=0, verbose_name="Unidades")
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0, verbose_name="Importe")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['brand', 'day'], name='shop_brandsalesdaily_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['day']),
+        ]
+        verbose_name_plural = "Ventas diarias por marca"
+
+    def __str__(self):
+        return f"{self.brand_id} {self.day}"
+
+
+class VariantSales(models.Model):
+    '''
+    Totales acumulados de ventas por variante, para el ranking de variantes más vendidas.
+    Se identifica por SKU para no perder el historial cuando la variante se archiva (ver shop.archive).
+        - sku: SKU de la variante vendida.
+        - variant: Variante vendida (queda en NULL si la variante se archiva o se borra).
+        - name: Nombre de la variante al momento de la primera venta, para mostrarla si ya no existe.
+        - units: Unidades vendidas.
+        - revenue: Importe total vendido.
+        - Meta:
+            - indexes: Índice descendente en 'units' para leer el top sin ordenar toda la tabla.
+    '''
+    sku = models.UUIDField(unique=True, verbose_name="SKU")
+    variant = models.OneToOneField(ProductVariant, null=True, blank=True, related_name='sales', on_delete=models.SET_NULL, verbose_name="Variante")
+    name = models.CharField(max_length=600, blank=True, verbose_name="Nombre")
+    units = models.PositiveIntegerField(default=0, verbose_name="Unidades")
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0, verbose_name="Importe")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-units'], name='shop_variantsales_units_idx'),
+        ]
+        verbose_name_plural = "Ventas por variante"
+
+    def __str__(self):
+        return f"{self.name or self.sku}: {self.units}"
@@ -0,0 +1,231 @@
+import math
+
+import numpy as np
+from scipy import sparse
+
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Q
+from django.utils import timezone
+
+from .models import Product, ProductVariant, RelatedProduct
+
+# Peso de cada grupo de características dentro del vector de un producto.
+# La categoría y la marca pesan más que los atributos sueltos (talle, color, etc.).
+FEATURE_WEIGHTS = {
+    'category': 3.0,
+    'parent': 1.5,
+    'brand': 2.0,
+    'attr': 1.0,
+    'spec': 1.0,
+}
+
+
+def _json_tokens(prefix, data):
+    '''
+    Convierte un campo JSON (attributes / base_specs) en tokens "prefijo:clave=valor".
+    Las listas generan un token por elemento y los diccionarios anidados se aplanan con "clave.subclave".
+    '''
+    if not isinstance(data, dict):
+        return
+    for key, value in data.items():
+        key = str(key).strip().lower()
+        if isinstance(value, dict):
+            yield from _json_tokens(f"{prefix}:{key}", value)
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                yield f"{prefix}:{key}={str(item).strip().lower()}"
+        elif value not in (None, ''):
+            yield f"{prefix}:{key}={str(value).strip().lower()}"
+
+
+def build_feature_matrix(products, variants):
+    '''
+    Construye la matriz dispersa (productos x características) normalizada por filas.
+        - products: Iterable de tuplas (id, category_id, parent_id, base_specs).
+        - variants: Iterable de tuplas (product_id, brand_id, attributes).
+    Cada columna se pondera por su IDF para que los valores muy comunes (ej: "color=negro") aporten poco.
+    Devuelve (matriz CSR, lista de ids de producto en el orden de las filas).
+    '''
+    product_ids = []
+    features = {}
+    for product_id, category_id, parent_id, base_specs in products:
+        tokens = {f"category:{category_id}": FEATURE_WEIGHTS['category']}
+        if parent_id:
+            tokens[f"parent:{parent_id}"] = FEATURE_WEIGHTS['parent']
+        for token in _json_tokens('spec', base_specs):
+            tokens[token] = FEATURE_WEIGHTS['spec']
+        features[product_id] = tokens
+        product_ids.append(product_id)
+
+    for product_id, brand_id, attributes in variants:
+        tokens = features.get(product_id)
+        if tokens is None:
+            continue
+        if brand_id:
+            tokens[f"brand:{brand_id}"] = FEATURE_WEIGHTS['brand']
+        for token in _json_tokens('attr', attributes):
+            tokens[token] = FEATURE_WEIGHTS['attr']
+
+    vocabulary = {}
+    rows, cols, values = [], [], []
+    for row, product_id in enumerate(product_ids):
+        for token, weight in features[product_id].items():
+            rows.append(row)
+            cols.append(vocabulary.setdefault(token, len(vocabulary)))
+            values.append(weight)
+
+    matrix = sparse.csr_matrix(
+        (np.asarray(values, dtype=np.float32), (rows, cols)),
+        shape=(len(product_ids), len(vocabulary)),
+    )
+    if not product_ids:
+        return matrix, product_ids
+
+    # IDF por columna: log(n / df) + 1
+    document_frequency = np.bincount(matrix.indices, minlength=matrix.shape[1])
+    idf = np.log(len(product_ids) / np.maximum(document_frequency, 1)).astype(np.float32) + 1
+    matrix = matrix @ sparse.diags(idf)
+
+    # Normalización L2 por fila: el producto punto pasa a ser la similitud coseno.
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    matrix = sparse.diags(1 / norms) @ matrix
+    return matrix.tocsr(), product_ids
+
+
+def top_k_neighbors(matrix, rows, k, chunk_size=500):
+    '''
+    Calcula los k vecinos más similares para las filas indicadas, procesando de a chunk_size filas
+    para que la matriz densa de similitudes (chunk x productos) entre siempre en memoria.
+    Genera tuplas (filas del bloque, índices de vecinos, similitudes) ordenadas de mayor a menor.
+    Si el catálogo tiene un solo producto, cada fila se genera sin vecinos.
+    '''
+    total = matrix.shape[0]
+    k = min(k, total - 1)
+    matrix_t = matrix.T.tocsc()
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        if k <= 0:
+            empty = np.empty((len(chunk), 0))
+            yield chunk, empty.astype(np.int64), empty
+            continue
+        scores = (matrix[chunk] @ matrix_t).toarray()
+        # Un producto nunca es su propio vecino
+        scores[np.arange(len(chunk)), chunk] = -1
+
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        yield (
+            chunk,
+            np.take_along_axis(top, order, axis=1),
+            np.take_along_axis(top_scores, order, axis=1),
+        )
+
+
+def stale_products():
+    '''
+    Productos cuyas sugerencias hay que recalcular: los que nunca se calcularon
+    y los que (o alguna de sus variantes) cambiaron después del último cálculo.
+    Incluye los inactivos, para poder encontrar los productos que todavía los sugieren.
+    '''
+    changed_variants = ProductVariant.objects.filter(
+        product=OuterRef('pk'),
+        updated_at__gt=OuterRef('related_computed_at'),
+    )
+    return Product.objects.filter(
+        Q(related_computed_at__isnull=True)
+        | Q(updated_at__gt=F('related_computed_at'))
+        | Exists(changed_variants)
+    )
+
+
+def _save_neighbors(ids, chunk, neighbors, scores, computed_at):
+    '''
+    Reemplaza las filas de RelatedProduct de un bloque de productos y marca el momento del cálculo.
+    '''
+    chunk_ids = ids[chunk].tolist()
+    links = [
+        RelatedProduct(
+            product_id=int(ids[row]),
+            related_id=int(ids[neighbor]),
+            rank=rank,
+            score=float(score),
+            computed_at=computed_at,
+        )
+        for row, row_neighbors, row_scores in zip(chunk, neighbors, scores)
+        for rank, (neighbor, score) in enumerate(
+            (n, s) for n, s in zip(row_neighbors, row_scores) if s > 0 and math.isfinite(s)
+        )
+    ]
+    with transaction.atomic():
+        RelatedProduct.objects.filter(product_id__in=chunk_ids).delete()
+        RelatedProduct.objects.bulk_create(links)
+        # update() no dispara auto_now, así que updated_at no cambia
+        Product.objects.filter(id__in=chunk_ids).update(related_computed_at=computed_at)
+
+
+def rebuild_related_products(k=8, chunk_size=500, full=False):
+    '''
+    Recalcula la tabla de vecinos (RelatedProduct).
+    Los vectores se construyen para todo el catálogo activo, pero salvo que se pida full=True
+    solo se reescriben las filas afectadas por los productos modificados:
+        - los productos modificados;
+        - los que hoy sugieren a un producto modificado (su ranking o su score pudo cambiar);
+        - los vecinos nuevos de los productos modificados, que probablemente ahora deban sugerirlos
+          (la similitud es simétrica).
+    Esto último es una aproximación: un producto nuevo podría entrar en el top-k de otro que no
+    está entre sus propios vecinos, por eso conviene correr periódicamente con full=True.
+    Las sugerencias propias de los productos que pasaron a inactivos se borran.
+    Devuelve la cantidad de productos recalculados.
+    '''
+    started_at = timezone.now()
+
+    products = (
+        Product.active
+        .order_by('id')
+        .values_list('id', 'category_id', 'category__parent_id', 'base_specs')
+    )
+    variants = (
+        ProductVariant.active
+        .order_by()
+        .values_list('product_id', 'brand_id', 'attributes')
+    )
+    matrix, product_ids = build_feature_matrix(products.iterator(), variants.iterator())
+    ids = np.asarray(product_ids, dtype=np.int64)
+    positions = {product_id: row for row, product_id in enumerate(product_ids)}
+
+    stale_ids = set(stale_products().values_list('id', flat=True))
+    # Productos que dejaron el catálogo activo: no tienen vector, solo se limpian sus filas
+    inactive_ids = stale_ids - positions.keys()
+    if full:
+        changed_ids = set(product_ids)
+        target_ids = changed_ids
+    else:
+        changed_ids = stale_ids
+        linking_ids = RelatedProduct.objects.filter(related_id__in=stale_ids).values_list('product_id', flat=True)
+        target_ids = changed_ids | set(linking_ids)
+
+    done = set()
+    pending = sorted(positions[product_id] for product_id in target_ids if product_id in positions)
+    while pending:
+        new_neighbors = set()
+        rows = np.array(pending, dtype=np.int64)
+        for chunk, neighbors, scores in top_k_neighbors(matrix, rows, k, chunk_size):
+            _save_neighbors(ids, chunk, neighbors, scores, started_at)
+            if not full:
+                for row, row_neighbors, row_scores in zip(chunk, neighbors, scores):
+                    if int(ids[row]) in changed_ids:
+                        new_neighbors.update(int(n) for n, s in zip(row_neighbors, row_scores) if s > 0)
+        done.update(pending)
+        # Segunda pasada (una sola): los vecinos de los modificados que todavía no se recalcularon
+        pending = sorted(new_neighbors - done)
+        changed_ids = set()
+
+    if inactive_ids:
+        # Se marcan como calculados para que no vuelvan a figurar como modificados en cada corrida
+        with transaction.atomic():
+            RelatedProduct.objects.filter(product_id__in=inactive_ids).delete()
+            Product.objects.filter(id__in=inactive_ids).update(related_computed_at=started_at)
+
+    return len(done)
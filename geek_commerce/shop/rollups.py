@@ -0,0 +1,103 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ArchivedProductVariant, BrandSalesDaily, CategorySalesDaily, ProductVariant, VariantSales
+
+
+def _increment(model, units, revenue, defaults=None, **lookup):
+    '''
+    Suma unidades e importe a la fila identificada por `lookup`, creándola (con `defaults`) si no existe.
+    El UPDATE con F() es atómico en la base; si dos procesos crean la misma fila a la vez,
+    el que pierde la carrera recibe IntegrityError y reintenta como UPDATE.
+    '''
+    increments = {'units': F('units') + units, 'revenue': F('revenue') + revenue}
+    if model.objects.filter(**lookup).update(**increments):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(units=units, revenue=revenue, **lookup, **(defaults or {}))
+    except IntegrityError:
+        model.objects.filter(**lookup).update(**increments)
+
+
+def apply_sales(rows):
+    '''
+    Acumula en los rollups un lote de ventas.
+        - rows: Iterable de tuplas (variant_id, day, quantity, amount).
+    Agrupa primero en memoria, así cada (categoría, día), (marca, día) y variante se escribe una sola vez
+    por lote, y resuelve categoría y marca de todas las variantes con una única consulta
+    (más otra sobre las variantes archivadas, para las ventas históricas de productos ya archivados).
+    '''
+    rows = list(rows)
+    if not rows:
+        return
+    fields = ('id', 'product__category_id', 'brand_id', 'sku', 'product__name', 'name')
+    variant_ids = {row[0] for row in rows}
+    dimensions = {
+        values[0]: (*values[1:], True)
+        for values in ProductVariant.objects.filter(id__in=variant_ids).values_list(*fields)
+    }
+    archived_ids = variant_ids - dimensions.keys()
+    if archived_ids:
+        dimensions.update(
+            (values[0], (*values[1:], False))
+            for values in ArchivedProductVariant.objects.filter(id__in=archived_ids).values_list(*fields)
+        )
+
+    by_category = defaultdict(lambda: [0, Decimal('0')])
+    by_brand = defaultdict(lambda: [0, Decimal('0')])
+    by_variant = defaultdict(lambda: [0, Decimal('0')])
+    for variant_id, day, quantity, amount in rows:
+        if variant_id not in dimensions:
+            continue
+        category_id, brand_id = dimensions[variant_id][:2]
+        amount = Decimal(amount)
+        targets = [by_category[(category_id, day)], by_variant[variant_id]]
+        if brand_id:
+            targets.append(by_brand[(brand_id, day)])
+        for totals in targets:
+            totals[0] += quantity
+            totals[1] += amount
+
+    # Las filas se actualizan siempre en el mismo orden (por clave): dos pedidos concurrentes con las mismas
+    # categorías, marcas o variantes toman los locks en el mismo orden y no pueden bloquearse mutuamente
+    with transaction.atomic():
+        for (category_id, day), (units, revenue) in sorted(by_category.items()):
+            _increment(CategorySalesDaily, units, revenue, category_id=category_id, day=day)
+        for (brand_id, day), (units, revenue) in sorted(by_brand.items()):
+            _increment(BrandSalesDaily, units, revenue, brand_id=brand_id, day=day)
+        for variant_id, (units, revenue) in sorted(by_variant.items()):
+            _, _, sku, product_name, name, is_live = dimensions[variant_id]
+            defaults = {
+                'variant_id': variant_id if is_live else None,
+                'name': f"{product_name} - {name}"[:VariantSales._meta.get_field('name').max_length],
+            }
+            _increment(VariantSales, units, revenue, defaults=defaults, sku=sku)
+
+
+def record_sale_lines(lines, sold_at=None):
+    '''
+    Punto de entrada para el checkout: registra las líneas de un pedido confirmado en los rollups.
+        - lines: Iterable de tuplas (variante o id de variante, cantidad, importe de la línea).
+        - sold_at: Fecha y hora de la venta (por defecto, ahora).
+    Debe llamarse dentro de la misma transacción que guarda el pedido.
+    '''
+    day = timezone.localdate(sold_at) if sold_at else timezone.localdate()
+    apply_sales(
+        (getattr(variant, 'pk', variant), day, quantity, amount)
+        for variant, quantity, amount in lines
+    )
+
+
+def reset_sales_rollups():
+    '''
+    Vacía todas las tablas de rollups de ventas (paso previo a una reconstrucción completa).
+    '''
+    with transaction.atomic():
+        CategorySalesDaily.objects.all().delete()
+        BrandSalesDaily.objects.all().delete()
+        VariantSales.objects.all().delete()
@@ -0,0 +1,183 @@
+import re
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.http import Http404, HttpResponsePermanentRedirect
+from django.urls import reverse
+from django.utils.text import slugify
+
+# Lugar reservado al final del slug para el sufijo de desambiguación ("-2" ... "-9999")
+SUFFIX_RESERVE = 5
+
+
+def _slug_max_length(model):
+    return model._meta.get_field('slug').max_length
+
+
+def _base_slug(model, source):
+    return slugify(source)[:_slug_max_length(model)].strip('-') or 'item'
+
+
+def _taken_slugs(model, bases, exclude_pk=None):
+    '''
+    Slugs ya usados que podrían chocar con `bases`: los de la tabla del modelo y los del historial
+    (un slug viejo no se reasigna, porque su URL sigue redirigiendo). Una sola consulta (UNION).
+    '''
+    from .models import SlugHistory
+
+    max_length = _slug_max_length(model)
+    condition = Q()
+    for base in set(bases):
+        condition |= Q(slug__startswith=base[:max_length - SUFFIX_RESERVE])
+
+    current = model._default_manager.filter(condition)
+    history = SlugHistory.objects.filter(condition, model=model._meta.label_lower)
+    if exclude_pk is not None:
+        current = current.exclude(pk=exclude_pk)
+        history = history.exclude(object_id=exclude_pk)
+    current = current.order_by().values_list('slug', flat=True)
+    history = history.order_by().values_list('slug', flat=True)
+    return set(current.union(history))
+
+
+def allocate_slugs(model, sources, exclude_pk=None):
+    '''
+    Genera slugs únicos para una lista de textos (nombres) con una sola consulta por lote.
+    Si el slug base está ocupado (en la tabla, en el historial o dentro del mismo lote),
+    agrega el menor sufijo libre: "remera-negra", "remera-negra-2", "remera-negra-3"...
+    Devuelve los slugs en el mismo orden que `sources`.
+    '''
+    max_length = _slug_max_length(model)
+    bases = [_base_slug(model, source) for source in sources]
+    if not bases:
+        return []
+    taken = _taken_slugs(model, bases, exclude_pk)
+
+    slugs = []
+    for base in bases:
+        slug = base
+        number = 2
+        while slug in taken:
+            suffix = f"-{number}"
+            slug = f"{base[:max_length - len(suffix)].rstrip('-')}{suffix}"
+            number += 1
+        taken.add(slug)
+        slugs.append(slug)
+    return slugs
+
+
+def assign_slugs(instances):
+    '''
+    Asigna slug a todas las instancias nuevas sin slug de un lote (útil antes de bulk_create,
+    que no llama a save()). Todas deben ser del mismo modelo e implementar get_slug_source().
+    '''
+    pending = [instance for instance in instances if not instance.slug]
+    if not pending:
+        return
+    model = type(pending[0])
+    for instance, slug in zip(pending, allocate_slugs(model, [obj.get_slug_source() for obj in pending])):
+        instance.slug = slug
+
+
+def _matches_base(slug, base, max_length):
+    '''
+    Indica si `slug` es el slug base o una de sus variantes con sufijo ("remera-negra-2").
+    '''
+    if slug == base:
+        return True
+    match = re.fullmatch(r"(.+)(-\d+)", slug)
+    return bool(match) and match.group(1) == base[:max_length - len(match.group(2))].rstrip('-')
+
+
+def prepare_slug(instance):
+    '''
+    Se llama desde save() antes de guardar. Asigna el slug a las instancias nuevas y, si el nombre
+    cambió (el slug guardado ya no corresponde al nombre), genera uno nuevo.
+    Devuelve el slug anterior cuando cambió (para registrarlo en el historial), o None.
+    '''
+    model = type(instance)
+    if instance.pk is None:
+        if not instance.slug:
+            instance.slug = allocate_slugs(model, [instance.get_slug_source()])[0]
+        return None
+
+    previous = model._default_manager.filter(pk=instance.pk).values_list('slug', flat=True).first()
+    if previous is None:
+        if not instance.slug:
+            instance.slug = allocate_slugs(model, [instance.get_slug_source()])[0]
+        return None
+    if instance.slug and instance.slug != previous:
+        # El slug se cambió a mano
+        return previous
+
+    base = _base_slug(model, instance.get_slug_source())
+    if _matches_base(previous, base, _slug_max_length(model)):
+        instance.slug = previous
+        return None
+    instance.slug = allocate_slugs(model, [instance.get_slug_source()], exclude_pk=instance.pk)[0]
+    return previous
+
+
+def record_slug_change(instance, previous):
+    '''
+    Registra en SlugHistory que `previous` ahora apunta al slug actual de la instancia.
+    Las entradas viejas de la misma instancia se actualizan para apuntar directo al slug nuevo,
+    así una URL vieja siempre se resuelve con una sola consulta y un solo 301 (sin cadenas).
+    '''
+    from .models import SlugHistory
+
+    label = instance._meta.label_lower
+    history = SlugHistory.objects.filter(model=label)
+    history.filter(object_id=instance.pk).update(target_slug=instance.slug)
+    SlugHistory.objects.update_or_create(
+        model=label, slug=previous,
+        defaults={'object_id': instance.pk, 'target_slug': instance.slug},
+    )
+    # Si se volvió a un slug anterior, deja de ser una redirección
+    history.filter(slug=instance.slug).delete()
+
+
+def save_with_slug(instance, save, *args, **kwargs):
+    '''
+    Envuelve el save() de los modelos con slug: asigna o renueva el slug, guarda y,
+    si el slug cambió, registra el anterior en el historial, todo en una transacción.
+    Si dos requests generan a la vez el mismo slug, el que pierde la carrera recibe IntegrityError
+    al guardar; en ese caso se vuelve a calcular el slug (ya viendo el del otro) y se reintenta una vez.
+    '''
+    original_slug = instance.slug
+    for attempt in range(2):
+        try:
+            with transaction.atomic():
+                previous = prepare_slug(instance)
+                save_kwargs = dict(kwargs)
+                if previous and save_kwargs.get('update_fields') is not None:
+                    save_kwargs['update_fields'] = {*save_kwargs['update_fields'], 'slug'}
+                save(*args, **save_kwargs)
+                if previous:
+                    record_slug_change(instance, previous)
+            return
+        except IntegrityError:
+            # Solo se reintenta si el slug lo generamos nosotros (un slug puesto a mano no se cambia)
+            if attempt or instance.slug == original_slug:
+                raise
+            instance.slug = original_slug
+
+
+def get_object_or_slug_redirect(queryset, slug, url_name, url_kwarg='slug'):
+    '''
+    Para las vistas de detalle: busca el objeto por slug; si no existe pero el slug está en el historial,
+    devuelve un 301 a la URL actual. Devuelve (objeto, None) o (None, redirección); si no hay nada, 404.
+    '''
+    from .models import SlugHistory
+
+    obj = queryset.filter(slug=slug).first()
+    if obj is not None:
+        return obj, None
+    target = (
+        SlugHistory.objects.filter(model=queryset.model._meta.label_lower, slug=slug)
+        .values_list('target_slug', flat=True)
+        .first()
+    )
+    if target is None:
+        raise Http404
+    return None, HttpResponsePermanentRedirect(reverse(url_name, kwargs={url_kwarg: target}))
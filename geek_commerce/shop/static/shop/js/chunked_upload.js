@@ -0,0 +1,117 @@
+/*
+ * Subida de imágenes por partes para el admin de variantes.
+ * Cada archivo: calcula su SHA-256, abre (o reanuda) una sesión, envía los chunks en orden
+ * y al final pide al servidor que verifique el checksum y cree el ProductImage.
+ * El id de la sesión se guarda en localStorage para poder reanudar tras un corte o recarga.
+ */
+(function() {
+    var box = document.getElementById('chunked-upload');
+    if (!box) {
+        return;
+    }
+    var startUrl = box.dataset.startUrl;
+    var variant = box.dataset.variant;
+    var chunkSize = parseInt(box.dataset.chunkSize, 10);
+    var progressList = box.querySelector('.chunked-upload-progress');
+
+    function csrfToken() {
+        var match = document.cookie.match(/(?:^|;\s*)csrftoken=([^;]+)/);
+        if (match) {
+            return decodeURIComponent(match[1]);
+        }
+        var input = document.querySelector('input[name=csrfmiddlewaretoken]');
+        return input ? input.value : '';
+    }
+
+    function sessionKey(file) {
+        return ['chunked-upload', variant, file.name, file.size, file.lastModified].join(':');
+    }
+
+    async function sha256(file) {
+        var digest = await crypto.subtle.digest('SHA-256', await file.arrayBuffer());
+        return Array.from(new Uint8Array(digest)).map(function(b) {
+            return b.toString(16).padStart(2, '0');
+        }).join('');
+    }
+
+    async function request(url, options) {
+        options = options || {};
+        options.headers = Object.assign({'X-CSRFToken': csrfToken()}, options.headers || {});
+        options.credentials = 'same-origin';
+        var response = await fetch(url, options);
+        var data = await response.json();
+        return {status: response.status, data: data};
+    }
+
+    async function openSession(file) {
+        var saved = localStorage.getItem(sessionKey(file));
+        if (saved) {
+            var status = await request(startUrl + saved + '/');
+            if (status.status === 200) {
+                return {id: saved, offset: status.data.offset};
+            }
+            localStorage.removeItem(sessionKey(file));
+        }
+        var form = new FormData();
+        form.append('variant', variant);
+        form.append('filename', file.name);
+        form.append('size', file.size);
+        form.append('checksum', await sha256(file));
+        var created = await request(startUrl, {method: 'POST', body: form});
+        if (created.status !== 200) {
+            throw new Error(created.data.error);
+        }
+        localStorage.setItem(sessionKey(file), created.data.id);
+        return {id: created.data.id, offset: created.data.offset};
+    }
+
+    async function uploadFile(file, item) {
+        var session = await openSession(file);
+        var offset = session.offset;
+        var retries = 0;
+        while (offset < file.size) {
+            item.textContent = file.name + ': ' + Math.floor(offset * 100 / file.size) + '%';
+            try {
+                var result = await request(startUrl + session.id + '/chunk/', {
+                    method: 'POST',
+                    headers: {'Content-Type': 'application/octet-stream', 'X-Upload-Offset': offset},
+                    body: file.slice(offset, offset + chunkSize)
+                });
+                // 409: el servidor indica desde dónde seguir
+                if (result.status !== 200 && result.status !== 409) {
+                    throw new Error(result.data.error);
+                }
+                offset = result.data.offset;
+                retries = 0;
+            } catch (error) {
+                if (++retries > 3) {
+                    throw error;
+                }
+            }
+        }
+        var done = await request(startUrl + session.id + '/completar/', {method: 'POST'});
+        localStorage.removeItem(sessionKey(file));
+        if (done.status !== 200) {
+            throw new Error(done.data.error);
+        }
+        item.textContent = file.name + ': listo';
+    }
+
+    box.querySelector('.chunked-upload-start').addEventListener('click', async function() {
+        var files = box.querySelector('.chunked-upload-files').files;
+        var failed = false;
+        for (var i = 0; i < files.length; i++) {
+            var item = document.createElement('li');
+            progressList.appendChild(item);
+            try {
+                await uploadFile(files[i], item);
+            } catch (error) {
+                failed = true;
+                item.textContent = files[i].name + ': error (' + error.message + ')';
+            }
+        }
+        if (files.length && !failed) {
+            window.location.reload();
+        }
+    });
+})();
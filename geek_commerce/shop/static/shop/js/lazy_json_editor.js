@@ -0,0 +1,38 @@
+/*
+ * Inicializa los JSONEditor de LazyJSONEditorWidget recién cuando el usuario los abre.
+ * Usa delegación de eventos, así también funciona con las filas que el admin agrega
+ * dinámicamente ("Agregar otra variante").
+ */
+(function() {
+    document.addEventListener('click', function(event) {
+        var button = event.target.closest('.lazy-json-open');
+        if (!button) {
+            return;
+        }
+        var wrapper = button.closest('.lazy-json-editor');
+        if (wrapper.jsonEditor) {
+            return;
+        }
+        var container = wrapper.querySelector('.lazy-json-container');
+        var textarea = wrapper.querySelector('textarea');
+        var options = JSON.parse(wrapper.dataset.options);
+
+        var editor;
+        options.onChange = function() {
+            try {
+                textarea.value = JSON.stringify(editor.get());
+            } catch (error) {
+                // JSON inválido mientras se escribe: se conserva el último valor válido
+            }
+        };
+
+        container.style.display = '';
+        wrapper.querySelector('.lazy-json-preview').style.display = 'none';
+        button.style.display = 'none';
+
+        editor = new JSONEditor(container, options);
+        editor.set(JSON.parse(textarea.value || '{}'));
+        wrapper.jsonEditor = editor;
+        container.jsonEditor = editor;
+    });
+})();
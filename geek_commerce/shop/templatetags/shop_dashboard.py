@@ -0,0 +1,34 @@
+from datetime import timedelta
+
+from django import template
+from django.db.models import Sum
+from django.utils import timezone
+
+from shop.models import BrandSalesDaily, CategorySalesDaily, VariantSales
+
+register = template.Library()
+
+
+@register.inclusion_tag('shop/admin/sales_dashboard.html')
+def sales_dashboard(days=30, top=10):
+    '''
+    Widgets de ventas para la portada del admin. Solo lee las tablas de rollups,
+    por lo que el costo depende de la ventana de días y no del historial de pedidos.
+    '''
+    since = timezone.localdate() - timedelta(days=days - 1)
+    totals = dict(units=Sum('units'), revenue=Sum('revenue'))
+
+    category_sales = CategorySalesDaily.objects.filter(day__gte=since)
+    brand_sales = BrandSalesDaily.objects.filter(day__gte=since)
+
+    return {
+        'days': days,
+        'sales_per_day': category_sales.values('day').annotate(**totals).order_by('-day'),
+        # Se agrupa por id: los nombres se repiten (ej: "Remeras" dentro de dos categorías padre distintas)
+        'top_categories': (
+            category_sales.values('category_id', 'category__name', 'category__parent__name')
+            .annotate(**totals).order_by('-revenue')[:top]
+        ),
+        'top_brands': brand_sales.values('brand_id', 'brand__name').annotate(**totals).order_by('-revenue')[:top],
+        'top_variants': VariantSales.objects.select_related('variant__product').order_by('-units')[:top],
+    }
@@ -1,3 +1,958 @@
-from django.test import TestCase
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import uuid
+import zipfile
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError
+from django.http import Http404
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+import numpy as np
+from PIL import Image
+from scipy import sparse
+
+from . import autocomplete
+from .admin import ProductVariantInline
+from .archive import archive_products
+from .models import (
+    ArchivedProductVariant, Brand, BrandSalesDaily, Category, CategorySalesDaily, ImageUpload, Product, ProductImage,
+    ProductVariant, RelatedProduct, SlugHistory, VariantSales, set_products_active,
+)
+from .related import build_feature_matrix, rebuild_related_products, top_k_neighbors
+from . import rollups
+from .rollups import apply_sales, record_sale_lines
+from .templatetags.shop_dashboard import sales_dashboard
+from .slugs import _taken_slugs, allocate_slugs, assign_slugs, get_object_or_slug_redirect
+
+
+def png_bytes(size=(4, 4)):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, 'red').save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+# --- PRODUCTOS RELACIONADOS ---
+class FeatureMatrixTests(TestCase):
+    def test_rows_are_l2_normalized(self):
+        matrix, ids = build_feature_matrix(
+            [(1, 10, None, {'material': 'algodón'}), (2, 10, 5, {}), (3, 11, None, {})],
+            [(1, 7, {'color': ['negro', 'rojo']}), (99, 7, {'color': 'azul'})],
+        )
+
+        self.assertEqual(ids, [1, 2, 3])
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        np.testing.assert_allclose(norms, 1, rtol=1e-6)
+
+    def test_shared_features_increase_similarity(self):
+        matrix, _ = build_feature_matrix(
+            [(1, 10, None, {'material': 'algodón'}), (2, 10, None, {'material': 'algodón'}), (3, 11, None, {})],
+            [],
+        )
+        similarity = (matrix @ matrix.T).toarray()
+
+        self.assertAlmostEqual(similarity[0, 1], 1, places=5)
+        self.assertAlmostEqual(similarity[0, 2], 0, places=5)
+
+    def test_nested_json_and_lists_become_tokens(self):
+        matrix, _ = build_feature_matrix(
+            [(1, 10, None, {'medidas': {'alto': 10}}), (2, 10, None, {})],
+            [(1, None, {'color': ['negro', 'rojo']})],
+        )
+
+        # category + spec:medidas:alto=10 + attr:color=negro + attr:color=rojo
+        self.assertEqual(matrix[0].nnz, 4)
+
+    def test_empty_catalog(self):
+        matrix, ids = build_feature_matrix([], [])
+
+        self.assertEqual(ids, [])
+        self.assertEqual(matrix.shape, (0, 0))
+
+
+class TopKNeighborsTests(TestCase):
+    def setUp(self):
+        vectors = np.array([[1, 0, 0], [0.9, 0.1, 0], [0, 1, 0], [0.5, 0.5, 0]], dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        self.matrix = sparse.csr_matrix(vectors)
+
+    def test_neighbors_exclude_self_and_are_sorted(self):
+        rows = np.arange(4)
+        results = list(top_k_neighbors(self.matrix, rows, k=2))
+
+        chunk, neighbors, scores = results[0]
+        self.assertEqual(neighbors[0].tolist(), [1, 3])
+        for row, row_neighbors, row_scores in zip(chunk, neighbors, scores):
+            self.assertNotIn(row, row_neighbors)
+            self.assertTrue(np.all(np.diff(row_scores) <= 0))
+
+    def test_chunking_does_not_change_results(self):
+        rows = np.arange(4)
+        whole = list(top_k_neighbors(self.matrix, rows, k=3))[0]
+        chunked = list(top_k_neighbors(self.matrix, rows, k=3, chunk_size=1))
+
+        self.assertEqual(len(chunked), 4)
+        np.testing.assert_array_equal(np.vstack([c[1] for c in chunked]), whole[1])
+
+    def test_k_is_capped_by_catalog_size(self):
+        _, neighbors, _ = list(top_k_neighbors(self.matrix, np.arange(4), k=10))[0]
+
+        self.assertEqual(neighbors.shape, (4, 3))
+
+    def test_single_product_has_no_neighbors(self):
+        matrix = sparse.csr_matrix(np.array([[1.0, 0.0]], dtype=np.float32))
+
+        chunk, neighbors, scores = list(top_k_neighbors(matrix, np.arange(1), k=8))[0]
+
+        self.assertEqual(chunk.tolist(), [0])
+        self.assertEqual(neighbors.shape, (1, 0))
+
+
+class RebuildRelatedProductsTests(TestCase):
+    def setUp(self):
+        self.ropa = Category.objects.create(name="Ropa")
+        self.juegos = Category.objects.create(name="Juegos")
+        self.brand = Brand.objects.create(name="Geek")
+        self.remeras = [self.create_product(f"Remera {i}", self.ropa, 'algodón') for i in range(3)]
+        self.juegos_de_mesa = [self.create_product(f"Juego {i}", self.juegos, 'cartón') for i in range(3)]
+
+    def create_product(self, name, category, material, **kwargs):
+        product = Product.objects.create(
+            name=name, category=category, description=name, base_specs={'material': material}, **kwargs
+        )
+        ProductVariant.objects.create(product=product, name="Única", price=10, brand=self.brand)
+        return product
+
+    def related(self, product):
+        return set(RelatedProduct.objects.filter(product=product).values_list('related_id', flat=True))
+
+    def test_full_rebuild_computes_every_active_product(self):
+        self.assertEqual(rebuild_related_products(k=2, full=True), 6)
+
+        self.assertEqual(self.related(self.remeras[0]), {self.remeras[1].pk, self.remeras[2].pk})
+        self.assertFalse(Product.objects.filter(is_active=True, related_computed_at__isnull=True).exists())
+
+    def test_incremental_run_without_changes_does_nothing(self):
+        rebuild_related_products(k=2)
+
+        self.assertEqual(rebuild_related_products(k=2), 0)
+
+    def test_changed_product_and_products_linking_to_it_are_recomputed(self):
+        rebuild_related_products(k=2)
+        self.remeras[0].save()
+
+        # La remera modificada y las dos que la sugieren
+        self.assertEqual(rebuild_related_products(k=2), 3)
+
+    def test_new_product_enters_its_neighbors_lists(self):
+        rebuild_related_products(k=2)
+        # Un juego de mesa nuevo que además comparte el material de las remeras
+        new = self.create_product("Juego nuevo", self.juegos, 'cartón')
+
+        rebuild_related_products(k=2)
+
+        self.assertTrue(any(new.pk in self.related(juego) for juego in self.juegos_de_mesa))
+
+    def test_deactivated_product_is_cleaned_up_and_stamped(self):
+        rebuild_related_products(k=2)
+        inactive = self.remeras[0]
+        inactive.is_active = False
+        inactive.save()
+
+        rebuild_related_products(k=2)
+
+        self.assertFalse(RelatedProduct.objects.filter(product=inactive).exists())
+        self.assertFalse(RelatedProduct.objects.filter(related=inactive).exists())
+        inactive.refresh_from_db()
+        self.assertIsNotNone(inactive.related_computed_at)
+        self.assertEqual(rebuild_related_products(k=2), 0)
+
+    def test_single_active_product_is_stamped(self):
+        Product.objects.exclude(pk=self.remeras[0].pk).update(is_active=False)
+
+        self.assertEqual(rebuild_related_products(k=2), 1)
+        self.assertEqual(rebuild_related_products(k=2), 0)
+
+
+# --- AUTOCOMPLETADO ---
+class NormalizeTests(TestCase):
+    def test_lowercases_strips_accents_and_collapses_spaces(self):
+        self.assertEqual(autocomplete.normalize("  Cartuchera   Pokémon "), "cartuchera pokemon")
+        self.assertEqual(autocomplete.normalize("ÑANDÚ"), "nandu")
+
+
+class PrefixCacheTests(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name="Remeras")
+        Brand.objects.create(name="Pokémon Company")
+        Product.objects.create(name="Remera Negra", category=self.category, description="d")
+        Product.objects.create(name="Negra Negra", category=self.category, description="d")
+        Product.objects.create(name="Taza Vieja", category=self.category, description="d", is_active=False)
+        self.cache = autocomplete.PrefixCache()
+        self.cache.refresh(force=True)
+
+    def names(self, query, limit=10):
+        return [entry['name'] for entry in self.cache.lookup(query, limit)]
+
+    def test_matches_start_of_any_word(self):
+        self.assertEqual(self.names("neg"), ["Negra Negra", "Remera Negra"])
+        self.assertEqual(self.names("POKE"), ["Pokémon Company"])
+
+    def test_each_entry_appears_once(self):
+        # "negra negra" y "negra" son dos claves del mismo producto
+        self.assertEqual(self.names("negra").count("Negra Negra"), 1)
+
+    def test_respects_limit_and_skips_inactive_products(self):
+        self.assertEqual(len(self.names("re", limit=1)), 1)
+        self.assertEqual(self.names("taza"), [])
+
+    @override_settings(AUTOCOMPLETE_REFRESH_SECONDS=0)
+    def test_rebuilds_only_when_tables_change(self):
+        with mock.patch.object(self.cache, '_build', wraps=self.cache._build) as build:
+            self.cache.refresh()
+            self.assertEqual(build.call_count, 0)
+
+            Product.objects.create(name="Buzo Gris", category=self.category, description="d")
+            self.cache.refresh()
+            self.assertEqual(build.call_count, 1)
+
+        self.assertEqual(self.names("gris"), ["Buzo Gris"])
+
+    def test_does_not_query_within_refresh_interval(self):
+        with self.assertNumQueries(0):
+            self.cache.refresh()
+
+    @override_settings(AUTOCOMPLETE_MAX_PRODUCTS=1)
+    def test_partial_catalog_is_marked_incomplete(self):
+        self.cache.refresh(force=True)
+
+        self.assertFalse(self.cache.complete)
+        self.assertEqual(len([name for name in self.names("n") if name.endswith("Negra")]), 1)
+
+
+class SuggestTests(TestCase):
+    def setUp(self):
+        category = Category.objects.create(name="Remeras")
+        Product.objects.create(name="Remera Negra", category=category, description="d")
+        Product.objects.create(name="Remera Azul", category=category, description="d")
+        cache = mock.patch.object(autocomplete, 'prefix_cache', autocomplete.PrefixCache())
+        cache.start()
+        self.addCleanup(cache.stop)
+        database = mock.patch.object(
+            autocomplete, 'search_database',
+            return_value=[{'type': 'product', 'name': "Remera Roja", 'slug': 'remera-roja'}],
+        )
+        self.search_database = database.start()
+        self.addCleanup(database.stop)
+
+    def test_cache_hit_does_not_query_the_database(self):
+        results = autocomplete.suggest("rem")
+
+        self.assertEqual(len(results), 3)  # categoría + 2 productos
+        self.search_database.assert_not_called()
+
+    def test_falls_back_to_database_when_cache_finds_nothing(self):
+        results = autocomplete.suggest("rmera")
+
+        self.search_database.assert_called_once_with("rmera", 10)
+        self.assertEqual([entry['slug'] for entry in results], ['remera-roja'])
+
+    @override_settings(AUTOCOMPLETE_MAX_PRODUCTS=1)
+    def test_incomplete_cache_is_completed_from_database_without_duplicates(self):
+        self.search_database.return_value = [
+            {'type': 'category', 'name': "Remeras", 'slug': 'remeras'},
+            {'type': 'product', 'name': "Remera Roja", 'slug': 'remera-roja'},
+        ]
+
+        results = autocomplete.suggest("rem")
+
+        self.search_database.assert_called_once()
+        slugs = [entry['slug'] for entry in results]
+        self.assertEqual(len(slugs), len(set(slugs)))
+        self.assertIn('remera-roja', slugs)
+
+    @override_settings(AUTOCOMPLETE_MAX_PRODUCTS=1)
+    def test_incomplete_cache_with_enough_results_skips_database(self):
+        autocomplete.suggest("rem", limit=1)
+
+        self.search_database.assert_not_called()
+
+
+class AutocompleteViewTests(TestCase):
+    def get(self, **params):
+        return self.client.get(reverse('shop:autocomplete'), params)
+
+    def test_short_queries_return_nothing(self):
+        with mock.patch('shop.views.suggest') as suggest:
+            self.assertEqual(self.get(q=" a ").json(), {'results': []})
+        suggest.assert_not_called()
+
+    def test_limit_is_clamped_and_defaults_to_ten(self):
+        cases = [({}, 10), ({'limit': '5'}, 5), ({'limit': '500'}, 20), ({'limit': '0'}, 1), ({'limit': 'x'}, 10)]
+        for params, expected in cases:
+            with self.subTest(params=params), mock.patch('shop.views.suggest', return_value=[]) as suggest:
+                self.assertEqual(self.get(q=" remera ", **params).json(), {'results': []})
+                suggest.assert_called_once_with("remera", expected)
+
+    def test_only_get_is_allowed(self):
+        self.assertEqual(self.client.post(reverse('shop:autocomplete'), {'q': 'remera'}).status_code, 405)
+
+
+# --- ROLLUPS DE VENTAS ---
+class SalesRollupTestMixin:
+    def setUp(self):
+        self.mujer = Category.objects.create(name="Mujer")
+        self.hombre = Category.objects.create(name="Hombre")
+        self.remeras_mujer = Category.objects.create(name="Remeras", parent=self.mujer)
+        self.remeras_hombre = Category.objects.create(name="Remeras", parent=self.hombre)
+        self.brand = Brand.objects.create(name="Geek")
+        self.variant_mujer = self.create_variant("Remera Mujer", self.remeras_mujer, brand=self.brand)
+        self.variant_hombre = self.create_variant("Remera Hombre", self.remeras_hombre)
+
+    def create_variant(self, name, category, **kwargs):
+        product = Product.objects.create(name=name, category=category, description=name)
+        return ProductVariant.objects.create(product=product, name="M", price=10, **kwargs)
+
+
+class SalesRollupTests(SalesRollupTestMixin, TestCase):
+    def test_lines_are_grouped_per_category_brand_and_variant(self):
+        record_sale_lines([
+            (self.variant_mujer, 2, '20.00'),
+            (self.variant_mujer.pk, 1, '10.00'),
+            (self.variant_hombre, 1, '15.00'),
+        ])
+
+        sales = CategorySalesDaily.objects.get(category=self.remeras_mujer)
+        self.assertEqual((sales.units, sales.revenue), (3, 30))
+        self.assertEqual(BrandSalesDaily.objects.get().units, 3)  # la variante de hombre no tiene marca
+        self.assertEqual(VariantSales.objects.get(variant=self.variant_hombre).revenue, 15)
+
+    def test_increments_existing_rows(self):
+        record_sale_lines([(self.variant_mujer, 1, '10.00')])
+        record_sale_lines([(self.variant_mujer, 2, '20.00')])
+
+        self.assertEqual(CategorySalesDaily.objects.get(category=self.remeras_mujer).units, 3)
+        self.assertEqual(VariantSales.objects.get(variant=self.variant_mujer).units, 3)
+
+    def test_unknown_variants_are_ignored(self):
+        record_sale_lines([(10 ** 9, 1, '10.00')])
+
+        self.assertFalse(CategorySalesDaily.objects.exists())
+
+    def test_rows_are_written_in_key_order(self):
+        with mock.patch.object(rollups, '_increment', wraps=rollups._increment) as increment:
+            # Las líneas llegan en orden inverso al de las claves
+            record_sale_lines([(self.variant_hombre, 1, '10.00'), (self.variant_mujer, 1, '10.00')])
+
+        categories = [c.kwargs['category_id'] for c in increment.call_args_list if 'category_id' in c.kwargs]
+        variants = [c.kwargs['sku'] for c in increment.call_args_list if 'sku' in c.kwargs]
+        self.assertEqual(categories, sorted(categories))
+        expected = [v.sku for v in sorted([self.variant_mujer, self.variant_hombre], key=lambda v: v.pk)]
+        self.assertEqual(variants, expected)
+
+
+class RebuildSalesRollupsTests(SalesRollupTestMixin, TestCase):
+    def write_csv(self, rows):
+        handle = tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8')
+        self.addCleanup(os.remove, handle.name)
+        with handle:
+            handle.write("sku,quantity,amount,sold_at\n")
+            for row in rows:
+                handle.write(",".join(str(value) for value in row) + "\n")
+        return handle.name
+
+    def test_backfill_from_csv(self):
+        path = self.write_csv([
+            (self.variant_mujer.sku, 2, '20.00', '2026-01-10T12:00:00'),
+            (self.variant_mujer.sku, 1, '10.00', '2026-01-10T18:00:00'),
+            (self.variant_hombre.sku, 1, '15.00', '2026-01-11T10:00:00'),
+            (uuid.uuid4(), 5, '50.00', '2026-01-11T10:00:00'),
+        ])
+        stdout = io.StringIO()
+
+        call_command('rebuild_sales_rollups', path, batch_size=2, stdout=stdout)
+
+        self.assertIn("Líneas cargadas: 3 (SKU desconocido: 1)", stdout.getvalue())
+        sales = CategorySalesDaily.objects.get(category=self.remeras_mujer)
+        self.assertEqual((sales.day.isoformat(), sales.units, sales.revenue), ('2026-01-10', 3, 30))
+        self.assertEqual(VariantSales.objects.get(variant=self.variant_hombre).units, 1)
+
+    def test_reset_rebuilds_from_scratch(self):
+        record_sale_lines([(self.variant_mujer, 7, '70.00')])
+        path = self.write_csv([(self.variant_mujer.sku, 1, '10.00', '2026-01-10T12:00:00')])
+
+        call_command('rebuild_sales_rollups', path, reset=True, stdout=io.StringIO())
+
+        self.assertEqual(CategorySalesDaily.objects.get().units, 1)
+        self.assertEqual(VariantSales.objects.get().units, 1)
+
+    def test_requires_csv_or_reset(self):
+        with self.assertRaises(CommandError):
+            call_command('rebuild_sales_rollups')
+
+
+class SalesDashboardTests(SalesRollupTestMixin, TestCase):
+    def test_categories_with_the_same_name_are_not_merged(self):
+        record_sale_lines([(self.variant_mujer, 2, '20.00'), (self.variant_hombre, 1, '15.00')])
+
+        top = list(sales_dashboard()['top_categories'])
+
+        self.assertEqual(
+            [(row['category__parent__name'], row['category__name'], row['units']) for row in top],
+            [("Mujer", "Remeras", 2), ("Hombre", "Remeras", 1)],
+        )
+
+    def test_only_includes_days_inside_the_window(self):
+        record_sale_lines([(self.variant_mujer, 1, '10.00')])
+        record_sale_lines([(self.variant_mujer, 5, '50.00')], sold_at=timezone.now() - timedelta(days=40))
+
+        context = sales_dashboard(days=30)
+
+        self.assertEqual([row['units'] for row in context['sales_per_day']], [1])
+        self.assertEqual(context['top_brands'][0]['units'], 1)
+        # El ranking de variantes es acumulado, sin ventana de días
+        self.assertEqual(context['top_variants'][0].units, 6)
+
+    def test_renders_archived_variants_by_name(self):
+        product = Product.objects.create(name="Taza", category=self.remeras_mujer, description="d", is_active=False)
+        variant = ProductVariant.objects.create(product=product, name="Blanca", price=5)
+        record_sale_lines([(variant, 1, '5.00')])
+        archive_products([product.pk])
+
+        html = Template("{% load shop_dashboard %}{% sales_dashboard %}").render(Context())
+
+        self.assertIn("Mujer / Remeras", html)
+        self.assertIn("Taza - Blanca (archivada)", html)
+
+
+# --- ADMIN: INLINES PAGINADOS ---
+class PaginatedInlineTests(TestCase):
+    def setUp(self):
+        category = Category.objects.create(name="Ropa")
+        self.product = Product.objects.create(name="Remera", category=category, description="Remera")
+        # Nombres repetidos: el orden de las páginas depende del desempate por pk
+        self.variants = [
+            ProductVariant.objects.create(product=self.product, name=f"Talle {i // 2}", price=10)
+            for i in range(12)
+        ]
+        User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.login(username='admin', password='password')
+        self.url = reverse('admin:shop_product_change', args=[self.product.pk])
+
+    def get_page(self, page=None):
+        response = self.client.get(self.url, {'variants-page': page} if page else {})
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    @staticmethod
+    def form_data(form):
+        data = {}
+        for name in form.fields:
+            value = form[name].value()
+            if value is None or value is False:
+                continue
+            data[form.add_prefix(name)] = 'on' if value is True else value
+            # Campos con default callable: el navegador envía también el valor inicial oculto
+            if form.fields[name].show_hidden_initial:
+                data[form.add_initial_prefix(name)] = data[form.add_prefix(name)]
+        return data
+
+    def post_data(self, response):
+        '''Datos que enviaría el navegador sin modificar nada, a partir del formulario del GET.'''
+        data = self.form_data(response.context['adminform'].form)
+        for inline in response.context['inline_admin_formsets']:
+            formset = inline.formset
+            data.update({formset.management_form.add_prefix(k): v for k, v in formset.management_form.initial.items()})
+            for form in formset.forms:
+                data.update(self.form_data(form))
+        data['_continue'] = '1'
+        return data
+
+    def page_pks(self, response):
+        formset = response.context['inline_admin_formsets'][0].formset
+        return [form.instance.pk for form in formset.initial_forms]
+
+    def test_pages_are_stable_with_repeated_names(self):
+        first, second = self.page_pks(self.get_page()), self.page_pks(self.get_page(2))
+
+        self.assertEqual(first + second, [variant.pk for variant in self.variants])
+        self.assertEqual(len(first), ProductVariantInline.per_page)
+
+    def test_unchanged_rows_are_not_validated_or_saved(self):
+        response = self.get_page()
+        # Una fila con datos inválidos en la base que no se toca en el formulario
+        ProductVariant.objects.filter(pk=self.variants[1].pk).update(slug='slug invalido')
+        data = self.post_data(response)
+        data['variants-1-slug'] = 'slug invalido'
+        data['variants-0-price'] = '99.00'
+
+        with mock.patch.object(ProductVariant, 'save', autospec=True, side_effect=ProductVariant.save) as save:
+            response = self.client.post(self.url, data)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual([call.args[0].pk for call in save.call_args_list], [self.variants[0].pk])
+        self.assertEqual(ProductVariant.objects.get(pk=self.variants[0].pk).price, 99)
+
+    def test_rows_added_between_get_and_post_do_not_shift_the_page(self):
+        response = self.get_page()
+        # Otro usuario agrega una variante que ordena primero: la última fila de la página 1 pasa a la 2
+        ProductVariant.objects.create(product=self.product, name="Aaa", price=10)
+        data = self.post_data(response)
+        last = len(self.page_pks(response)) - 1
+        edited = self.page_pks(response)[last]
+        data[f'variants-{last}-price'] = '55.00'
+
+        response = self.client.post(self.url, data)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(ProductVariant.objects.get(pk=edited).price, 55)
+        self.assertEqual(ProductVariant.objects.count(), 13)
+
+
+# --- SUBIDA DE IMÁGENES POR PARTES ---
+class ImageUploadTests(TestCase):
+    '''
+    Flujo completo de una subida por partes contra las vistas: inicio, chunks, estado y cierre.
+    '''
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        category = Category.objects.create(name="Ropa")
+        product = Product.objects.create(name="Remera", category=category, description="Remera de algodón")
+        self.variant = ProductVariant.objects.create(product=product, name="M", price=10)
+        User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.login(username='admin', password='password')
+
+    def start(self, data, **overrides):
+        params = {
+            'variant': self.variant.pk,
+            'filename': 'foto.png',
+            'size': len(data),
+            'checksum': hashlib.sha256(data).hexdigest(),
+            **overrides,
+        }
+        return self.client.post(reverse('shop:image_upload_start'), params)
+
+    def send_chunk(self, upload_id, offset, chunk):
+        return self.client.post(
+            reverse('shop:image_upload_chunk', args=[upload_id]),
+            chunk,
+            content_type='application/octet-stream',
+            headers={'X-Upload-Offset': str(offset)},
+        )
+
+    def complete(self, upload_id):
+        return self.client.post(reverse('shop:image_upload_complete', args=[upload_id]))
+
+    def upload(self, data, declared=None):
+        '''Sube `data` en dos chunks; `declared` permite declarar un checksum distinto.'''
+        upload_id = self.start(data, **({'checksum': declared} if declared else {})).json()['id']
+        middle = len(data) // 2
+        self.assertEqual(self.send_chunk(upload_id, 0, data[:middle]).json(), {'offset': middle})
+        self.assertEqual(self.send_chunk(upload_id, middle, data[middle:]).json(), {'offset': len(data)})
+        return upload_id
+
+    def test_complete_creates_image_with_uploaded_bytes(self):
+        data = png_bytes()
+        upload_id = self.upload(data)
+
+        response = self.complete(upload_id)
+
+        self.assertEqual(response.status_code, 200)
+        image = ProductImage.objects.get(pk=response.json()['image'])
+        self.assertEqual(image.variant, self.variant)
+        with image.image.open('rb') as stored:
+            self.assertEqual(stored.read(), data)
+        # Completar de nuevo devuelve la misma imagen
+        self.assertEqual(self.complete(upload_id).json()['image'], image.pk)
+
+    def test_checksum_mismatch_discards_session_and_file(self):
+        data = png_bytes()
+        upload_id = self.upload(data, declared='0' * 64)
+        path = ImageUpload.objects.get(pk=upload_id).path
+
+        response = self.complete(upload_id)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['offset'], 0)
+        self.assertFalse(ImageUpload.objects.filter(pk=upload_id).exists())
+        self.assertFalse(os.path.exists(os.path.join(self.media_root, path)))
+        self.assertFalse(ProductImage.objects.exists())
+        # La sesión ya no existe: ni completar, ni reenviar chunks, ni consultar su estado
+        self.assertEqual(self.complete(upload_id).status_code, 404)
+        self.assertEqual(self.send_chunk(upload_id, 0, data).status_code, 404)
+        self.assertEqual(
+            self.client.get(reverse('shop:image_upload_status', args=[upload_id])).status_code, 404
+        )
+
+    def test_non_image_payload_is_rejected(self):
+        upload_id = self.upload(b'esto no es una imagen')
+
+        response = self.complete(upload_id)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(ImageUpload.objects.filter(pk=upload_id).exists())
+        self.assertFalse(ProductImage.objects.exists())
+
+    def test_incomplete_upload_cannot_be_completed(self):
+        data = png_bytes()
+        upload_id = self.start(data).json()['id']
+        self.send_chunk(upload_id, 0, data[:10])
+
+        response = self.complete(upload_id)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['offset'], 10)
+        self.assertTrue(ImageUpload.objects.filter(pk=upload_id).exists())
+
+    def test_unexpected_offset_returns_current_offset(self):
+        data = png_bytes()
+        upload_id = self.start(data).json()['id']
+        self.send_chunk(upload_id, 0, data[:10])
+
+        response = self.send_chunk(upload_id, 5, data[5:20])
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['offset'], 10)
+
+    def test_chunk_is_rejected_while_session_is_claimed(self):
+        data = png_bytes()
+        upload_id = self.start(data).json()['id']
+        ImageUpload.objects.filter(pk=upload_id).update(claimed_at=timezone.now())
+
+        response = self.send_chunk(upload_id, 0, data)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(ImageUpload.objects.get(pk=upload_id).received, 0)
+
+    def test_expired_claim_can_be_taken_over(self):
+        data = png_bytes()
+        upload_id = self.start(data).json()['id']
+        ImageUpload.objects.filter(pk=upload_id).update(claimed_at=timezone.now() - timedelta(hours=1))
+
+        response = self.send_chunk(upload_id, 0, data)
+
+        self.assertEqual(response.json(), {'offset': len(data)})
+        self.assertIsNone(ImageUpload.objects.get(pk=upload_id).claimed_at)
+
+    def test_concurrent_starts_never_share_a_file(self):
+        data = png_bytes()
+        # uuid7 solo cambia cada pocos milisegundos: dos sesiones pueden generar el mismo nombre
+        with mock.patch('shop.models.uuid.uuid7', return_value=uuid.UUID(int=1)):
+            first = self.start(data).json()['id']
+            second = self.start(data).json()['id']
+
+        paths = set(ImageUpload.objects.filter(pk__in=[first, second]).values_list('path', flat=True))
+        self.assertEqual(len(paths), 2)
+        self.send_chunk(first, 0, data)
+        self.assertEqual(
+            [os.path.getsize(os.path.join(self.media_root, path)) for path in sorted(paths)].count(0), 1
+        )
+
+    def test_abandoned_uploads_are_expired(self):
+        data = png_bytes()
+        old = timezone.now() - timedelta(days=2)
+        abandoned = self.start(data).json()['id']
+        busy = self.start(data).json()['id']
+        recent = self.start(data).json()['id']
+        ImageUpload.objects.filter(pk__in=[abandoned, busy]).update(updated_at=old)
+        ImageUpload.objects.filter(pk=busy).update(claimed_at=timezone.now())
+        completed = self.upload(data)
+        self.complete(completed)
+        ImageUpload.objects.filter(pk=completed).update(updated_at=old)
+        abandoned_path = os.path.join(self.media_root, ImageUpload.objects.get(pk=abandoned).path)
+        stdout = io.StringIO()
+
+        call_command('expire_image_uploads', hours=24, stdout=stdout)
+
+        self.assertIn("Subidas vencidas borradas: 1", stdout.getvalue())
+        self.assertFalse(os.path.exists(abandoned_path))
+        self.assertEqual(
+            set(ImageUpload.objects.values_list('pk', flat=True)),
+            {uuid.UUID(busy), uuid.UUID(recent), uuid.UUID(completed)},
+        )
+        self.assertEqual(ProductImage.objects.count(), 1)
+
+    def test_start_validates_parameters(self):
+        data = png_bytes()
+        invalid = [
+            {'size': 0},
+            {'size': 10 ** 12},
+            {'checksum': 'abc'},
+            {'filename': 'a' * 300 + '.png'},
+            {'filename': 'foto.exe'},
+            {'alt_text': 'a' * 301},
+            {'variant': 'abc'},
+        ]
+        for overrides in invalid:
+            with self.subTest(overrides=overrides):
+                self.assertEqual(self.start(data, **overrides).status_code, 400)
+        self.assertFalse(ImageUpload.objects.exists())
+
+
+class ImportProductImagesTests(TestCase):
+    '''
+    Carga masiva: solo se crean imágenes para archivos de variantes existentes y con contenido válido.
+    '''
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        category = Category.objects.create(name="Ropa")
+        product = Product.objects.create(name="Remera", category=category, description="Remera de algodón")
+        self.variant = ProductVariant.objects.create(product=product, name="M", price=10)
+
+    def test_imports_valid_images_and_rejects_invalid_ones(self):
+        source = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, source, ignore_errors=True)
+        files = {
+            f'{self.variant.sku}.png': png_bytes(),
+            f'{self.variant.sku}_2.jpg': b'no es una imagen',
+        }
+        for name, content in files.items():
+            with open(os.path.join(source, name), 'wb') as handle:
+                handle.write(content)
+
+        call_command('import_product_images', source, stdout=io.StringIO(), stderr=io.StringIO())
+
+        image = ProductImage.objects.get()
+        self.assertTrue(image.is_main)
+        self.assertTrue(image.image.name.endswith('.png'))
+        stored = [name for _, _, names in os.walk(self.media_root) for name in names]
+        self.assertEqual(len(stored), 1)
+
+    def test_imports_from_zip(self):
+        archive_path = os.path.join(tempfile.mkdtemp(), 'imagenes.zip')
+        self.addCleanup(shutil.rmtree, os.path.dirname(archive_path), ignore_errors=True)
+        with zipfile.ZipFile(archive_path, 'w') as archive:
+            archive.writestr(f'fotos/{self.variant.sku}.png', png_bytes())
+
+        call_command('import_product_images', archive_path, stdout=io.StringIO())
+
+        self.assertEqual(ProductImage.objects.filter(variant=self.variant).count(), 1)
+
+
+# --- ARCHIVO DE PRODUCTOS INACTIVOS ---
+class ArchiveProductsTests(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name="Ropa")
+        product = Product.objects.create(name="Remera", category=self.category, description="Remera", is_active=False)
+        self.variant = ProductVariant.objects.create(product=product, name="M", price=10)
+        record_sale_lines([(self.variant, 3, '30.00')])
+
+    def test_archiving_keeps_variant_sales(self):
+        archive_products([self.variant.product_id])
+
+        self.assertTrue(ArchivedProductVariant.objects.filter(sku=self.variant.sku).exists())
+        sales = VariantSales.objects.get(sku=self.variant.sku)
+        self.assertIsNone(sales.variant)
+        self.assertEqual(sales.name, "Remera - M")
+        self.assertEqual(sales.units, CategorySalesDaily.objects.get().units)
+
+    def test_sales_of_archived_variants_are_still_applied(self):
+        archive_products([self.variant.product_id])
+
+        apply_sales([(self.variant.pk, timezone.localdate(), 2, '20.00')])
+
+        self.assertEqual(VariantSales.objects.get(sku=self.variant.sku).units, 5)
+        self.assertEqual(CategorySalesDaily.objects.get(category=self.category).units, 5)
+
+    def test_archiving_keeps_variant_active_flag(self):
+        archive_products([self.variant.product_id])
+
+        self.assertFalse(ArchivedProductVariant.objects.get(sku=self.variant.sku).is_active)
+
+
+# --- CATÁLOGO ACTIVO ---
+class ProductActiveSyncTests(TestCase):
+    def setUp(self):
+        category = Category.objects.create(name="Ropa")
+        self.product = Product.objects.create(name="Remera", category=category, description="Remera")
+        self.variants = [ProductVariant.objects.create(product=self.product, name=name, price=10) for name in ("S", "M")]
+
+    def variant_flags(self, product):
+        return set(product.variants.values_list('is_active', flat=True))
+
+    def test_save_copies_product_flag_to_variants(self):
+        self.product.is_active = False
+        self.product.save()
+        self.assertEqual(self.variant_flags(self.product), {False})
+
+        self.product.is_active = True
+        self.product.save(update_fields=['is_active'])
+        self.assertEqual(self.variant_flags(self.product), {True})
+
+    def test_save_without_flag_change_keeps_variant_flags(self):
+        ProductVariant.objects.filter(pk=self.variants[0].pk).update(is_active=False)
+
+        self.product.name = "Remera lisa"
+        self.product.save()
+        self.product.is_active = False
+        self.product.save(update_fields=['name'])
+
+        self.assertEqual(self.variant_flags(self.product), {False, True})
+
+    def test_new_variant_of_inactive_product_is_inactive(self):
+        self.product.is_active = False
+        self.product.save()
+
+        variant = ProductVariant.objects.create(product=self.product, name="L", price=10)
+
+        self.assertFalse(variant.is_active)
+
+    def test_bulk_update_copies_flag_to_variants(self):
+        other = Product.objects.create(name="Buzo", category=self.product.category, description="Buzo")
+        ProductVariant.objects.create(product=other, name="M", price=20)
+
+        self.assertEqual(set_products_active(Product.objects.all(), False), 2)
+        self.assertFalse(ProductVariant.objects.filter(is_active=True).exists())
+        self.assertEqual(set_products_active([self.product.pk], True), 1)
+        self.assertEqual(self.variant_flags(self.product), {True})
+        self.assertEqual(self.variant_flags(other), {False})
+
+
+# --- SLUGS ---
+class SlugAllocationTests(TestCase):
+    def test_duplicate_names_get_numeric_suffix(self):
+        slugs = [Category.objects.create(name="Remera Negra").slug for _ in range(3)]
+
+        self.assertEqual(slugs, ['remera-negra', 'remera-negra-2', 'remera-negra-3'])
+
+    def test_batch_allocation_uses_a_single_query(self):
+        Category.objects.create(name="Remera Negra")
+        categories = [Category(name="Remera Negra"), Category(name="Remera Negra"), Category(name="Taza")]
+
+        with self.assertNumQueries(1):
+            assign_slugs(categories)
+
+        self.assertEqual([c.slug for c in categories], ['remera-negra-2', 'remera-negra-3', 'taza'])
+
+    def test_slugs_are_truncated_to_max_length(self):
+        max_length = Category._meta.get_field('slug').max_length
+        name = "Remera " + "muy " * 40 + "larga"
+
+        first = Category.objects.create(name=name)
+        second = Category.objects.create(name=name)
+
+        self.assertLessEqual(len(first.slug), max_length)
+        self.assertLessEqual(len(second.slug), max_length)
+        self.assertFalse(first.slug.endswith('-'))
+        self.assertTrue(second.slug.endswith('-2'))
+        self.assertEqual(second.slug[:-2], first.slug[:len(second.slug) - 2].rstrip('-'))
+
+    def test_empty_source_falls_back_to_placeholder(self):
+        self.assertEqual(allocate_slugs(Category, ["¡¡!!", "???"]), ['item', 'item-2'])
+
+    def test_manual_slug_is_kept(self):
+        category = Category.objects.create(name="Remera Negra", slug='remeras')
+
+        self.assertEqual(category.slug, 'remeras')
+
+    def test_manual_slug_collision_is_not_retried(self):
+        Category.objects.create(name="Remera Negra")
+
+        with self.assertRaises(IntegrityError):
+            Category.objects.create(name="Otra", slug='remera-negra')
+
+    def test_concurrent_collision_is_retried_once(self):
+        Category.objects.create(name="Remera Negra")
+        calls = []
+
+        def stale_taken_slugs(*args, **kwargs):
+            # La primera vez simula no ver la fila que otro request acaba de confirmar
+            calls.append(args)
+            return set() if len(calls) == 1 else _taken_slugs(*args, **kwargs)
+
+        with mock.patch('shop.slugs._taken_slugs', side_effect=stale_taken_slugs):
+            category = Category.objects.create(name="Remera Negra")
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(category.slug, 'remera-negra-2')
+
+
+class SlugHistoryTests(TestCase):
+    def setUp(self):
+        self.category = Category.objects.create(name="Remera Negra")
+
+    def rename(self, name, **kwargs):
+        self.category.name = name
+        self.category.save(**kwargs)
+        return self.category.slug
+
+    def history(self):
+        return dict(
+            SlugHistory.objects.filter(model='shop.category').values_list('slug', 'target_slug')
+        )
+
+    def test_rename_records_previous_slug(self):
+        self.assertEqual(self.rename("Remera Azul"), 'remera-azul')
+
+        self.assertEqual(self.history(), {'remera-negra': 'remera-azul'})
+
+    def test_successive_renames_point_to_current_slug(self):
+        self.rename("Remera Azul")
+        self.rename("Remera Roja")
+
+        self.assertEqual(self.history(), {'remera-negra': 'remera-roja', 'remera-azul': 'remera-roja'})
+
+    def test_rename_back_removes_redirect_to_itself(self):
+        self.rename("Remera Azul")
+        self.assertEqual(self.rename("Remera Negra"), 'remera-negra')
+
+        self.assertEqual(self.history(), {'remera-azul': 'remera-negra'})
+
+    def test_rename_keeping_base_keeps_suffixed_slug(self):
+        other = Category.objects.create(name="Remera Negra")
+        other.name = "Remera  negra"
+        other.save()
+
+        self.assertEqual(other.slug, 'remera-negra-2')
+        self.assertEqual(self.history(), {})
+
+    def test_old_slug_is_not_reassigned(self):
+        self.rename("Remera Azul")
+
+        self.assertEqual(Category.objects.create(name="Remera Negra").slug, 'remera-negra-2')
+
+    def test_update_fields_includes_new_slug(self):
+        self.rename("Remera Azul", update_fields=['name'])
+
+        self.assertEqual(Category.objects.get(pk=self.category.pk).slug, 'remera-azul')
+        self.assertEqual(self.history(), {'remera-negra': 'remera-azul'})
+
+    def test_manual_slug_change_is_recorded(self):
+        self.category.slug = 'remeras'
+        self.category.save()
+
+        self.assertEqual(self.history(), {'remera-negra': 'remeras'})
+
+    def test_old_slug_redirects_to_current_one(self):
+        self.rename("Remera Azul")
+        queryset = Category.objects.all()
+
+        with mock.patch('shop.slugs.reverse', side_effect=lambda name, kwargs: f"/categorias/{kwargs['slug']}/"):
+            obj, redirect = get_object_or_slug_redirect(queryset, 'remera-azul', 'categoria')
+            self.assertEqual((obj, redirect), (self.category, None))
+
+            obj, redirect = get_object_or_slug_redirect(queryset, 'remera-negra', 'categoria')
+            self.assertIsNone(obj)
+            self.assertEqual(redirect.status_code, 301)
+            self.assertEqual(redirect['Location'], '/categorias/remera-azul/')
+
+        with self.assertRaises(Http404):
+            get_object_or_slug_redirect(queryset, 'no-existe', 'categoria')
@@ -0,0 +1,185 @@
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from PIL import Image
+
+from .models import ImageUpload, ProductImage, get_upload_path
+
+# Tamaño de cada lectura del request al escribir un chunk (no se carga el chunk entero en memoria)
+STREAM_BLOCK_SIZE = 64 * 1024
+
+# Extensiones aceptadas en las subidas por partes y en la carga masiva
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.gif', '.avif'}
+
+# Si un request que tomó la sesión no termina en este tiempo (cliente colgado), otro puede retomarla
+CLAIM_TIMEOUT = timedelta(minutes=5)
+
+
+class UploadError(Exception):
+    '''
+    Error en una subida por partes. `offset` indica desde dónde debe reanudar el cliente.
+    '''
+    def __init__(self, message, offset=None):
+        super().__init__(message)
+        self.offset = offset
+
+
+def image_storage():
+    return ProductImage._meta.get_field('image').storage
+
+
+def max_upload_size():
+    return getattr(settings, 'IMAGE_UPLOAD_MAX_SIZE', 50 * 1024 * 1024)
+
+
+def verify_image(storage, name):
+    '''
+    Verifica con Pillow que el archivo guardado sea una imagen válida (lo mismo que hace ImageField
+    al validar un formulario). Devuelve False si no se puede abrir o está corrupta.
+    '''
+    try:
+        with storage.open(name, 'rb') as source, Image.open(source) as image:
+            image.verify()
+    except Exception:
+        return False
+    return True
+
+
+def start_upload(variant, filename, size, checksum, alt_text='', is_main=False):
+    '''
+    Abre una sesión de subida: reserva el nombre final con get_upload_path y crea el archivo vacío
+    en el storage, para que los chunks se escriban directamente en su ubicación definitiva.
+    storage.save() crea el archivo en forma exclusiva (O_EXCL) y, si el nombre ya existe, elige otro:
+    dos sesiones que empiezan a la vez nunca comparten archivo.
+    '''
+    storage = image_storage()
+    name = storage.save(get_upload_path(ProductImage(variant=variant), filename), ContentFile(b''))
+    return ImageUpload.objects.create(
+        variant=variant,
+        filename=filename,
+        path=name,
+        size=size,
+        checksum=checksum.lower(),
+        alt_text=alt_text,
+        is_main=is_main,
+    )
+
+
+def write_chunk(upload_id, offset, stream, length):
+    '''
+    Escribe un chunk en la posición `offset` leyendo el stream del request de a bloques.
+    Los chunks deben llegar en orden: si el offset no coincide con lo ya recibido se rechaza
+    y el cliente reanuda desde `received`.
+    La sesión se toma con un UPDATE condicional (claimed_at) y se libera al terminar; mientras se lee
+    el cuerpo del request no hay ninguna transacción abierta ni filas bloqueadas.
+    Devuelve el nuevo offset.
+    '''
+    upload = ImageUpload.objects.get(pk=upload_id, image__isnull=True)
+    if offset != upload.received:
+        raise UploadError("Offset inesperado", offset=upload.received)
+    if upload.received + length > upload.size:
+        raise UploadError("El chunk excede el tamaño declarado", offset=upload.received)
+
+    claimed_at = timezone.now()
+    claimed = ImageUpload.objects.filter(
+        Q(claimed_at__isnull=True) | Q(claimed_at__lt=claimed_at - CLAIM_TIMEOUT),
+        pk=upload_id,
+        image__isnull=True,
+        received=offset,
+    ).update(claimed_at=claimed_at)
+    if not claimed:
+        raise UploadError("Hay otro chunk en curso para esta subida", offset=upload.received)
+    session = ImageUpload.objects.filter(pk=upload_id, claimed_at=claimed_at)
+
+    written = 0
+    try:
+        with open(image_storage().path(upload.path), 'r+b') as destination:
+            destination.seek(offset)
+            while written < length:
+                block = stream.read(min(STREAM_BLOCK_SIZE, length - written))
+                if not block:
+                    break
+                destination.write(block)
+                written += len(block)
+            destination.truncate()
+    except BaseException:
+        # received no cambia: el próximo chunk vuelve a escribir desde el mismo offset
+        session.update(claimed_at=None)
+        raise
+
+    if not session.update(received=offset + written, claimed_at=None, updated_at=timezone.now()):
+        # La sesión venció y otro request la retomó; el cliente debe consultar el offset actual
+        received = ImageUpload.objects.filter(pk=upload_id).values_list('received', flat=True).first()
+        raise UploadError("La sesión fue retomada por otro request", offset=received)
+    return offset + written
+
+
+def _file_checksum(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as source:
+        for block in iter(lambda: source.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def complete_upload(upload_id):
+    '''
+    Cierra la sesión: verifica tamaño, SHA-256 y que el archivo sea una imagen válida, y crea el
+    ProductImage apuntando al archivo ya escrito (sin volver a copiarlo).
+    Si alguna verificación falla se descartan la sesión y el archivo, y el cliente debe empezar de nuevo.
+    '''
+    storage = image_storage()
+    error = None
+    with transaction.atomic():
+        upload = ImageUpload.objects.select_for_update().get(pk=upload_id)
+        if upload.image_id:
+            return upload.image
+        if upload.received != upload.size:
+            raise UploadError("La subida está incompleta", offset=upload.received)
+
+        if _file_checksum(storage.path(upload.path)) != upload.checksum:
+            error = "El checksum no coincide; la subida fue descartada"
+        elif not verify_image(storage, upload.path):
+            error = "El archivo no es una imagen válida; la subida fue descartada"
+
+        if error:
+            upload.delete()
+        else:
+            image = ProductImage(variant_id=upload.variant_id, alt_text=upload.alt_text, is_main=upload.is_main)
+            image.image.name = upload.path
+            image.save()
+            upload.image = image
+            upload.save(update_fields=['image', 'updated_at'])
+
+    # El archivo se borra recién cuando el borrado de la sesión quedó confirmado
+    if error:
+        storage.delete(upload.path)
+        raise UploadError(error, offset=0)
+    return image
+
+
+def expire_uploads(max_age):
+    '''
+    Borra las sesiones abandonadas (sin completar y sin actividad desde hace más de `max_age`)
+    junto con su archivo parcial, que de otro modo queda para siempre en el árbol de media.
+    Devuelve la cantidad de sesiones borradas.
+    '''
+    limit = timezone.now() - max_age
+    expired = ImageUpload.objects.filter(
+        Q(claimed_at__isnull=True) | Q(claimed_at__lt=limit),
+        image__isnull=True,
+        updated_at__lt=limit,
+    )
+    storage = image_storage()
+    total = 0
+    for upload in expired.only('pk', 'path').iterator():
+        # Borrado condicional: si la sesión recibió un chunk mientras tanto, se conserva
+        if expired.filter(pk=upload.pk).delete()[0]:
+            storage.delete(upload.path)
+            total += 1
+    return total
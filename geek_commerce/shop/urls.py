@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.urls import path
+
+from . import views
+
+app_name = 'shop'
+
+urlpatterns = [
+    path('buscar/autocompletar/', views.autocomplete, name='autocomplete'),
+]
+
+# Las subidas de imágenes son del admin (staff_member_required redirige a admin:login),
+# así que solo se montan en los procesos que sirven el admin
+if settings.SERVE_ADMIN:
+    urlpatterns += [
+        path('imagenes/subidas/', views.image_upload_start, name='image_upload_start'),
+        path('imagenes/subidas/<uuid:upload_id>/', views.image_upload_status, name='image_upload_status'),
+        path('imagenes/subidas/<uuid:upload_id>/chunk/', views.image_upload_chunk, name='image_upload_chunk'),
+        path('imagenes/subidas/<uuid:upload_id>/completar/', views.image_upload_complete, name='image_upload_complete'),
+    ]
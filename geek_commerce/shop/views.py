@@ -1,3 +1,113 @@
-from django.shortcuts import render
+import os
+import re
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, render
+from django.views.decorators.http import require_GET, require_POST
+
+from .autocomplete import suggest
+from .models import ImageUpload, ProductVariant
+from .uploads import IMAGE_EXTENSIONS, UploadError, complete_upload, max_upload_size, start_upload, write_chunk
 
 # Create your views here.
+@require_GET
+def autocomplete(request):
+    '''
+    Sugerencias para la caja de búsqueda mientras el usuario escribe.
+    GET ?q=<texto>&limit=<n>  ->  {"results": [{"type": ..., "name": ..., "slug": ...}, ...]}
+    '''
+    query = request.GET.get('q', '').strip()
+    try:
+        limit = min(max(int(request.GET.get('limit', 10)), 1), 20)
+    except ValueError:
+        limit = 10
+    if len(query) < 2:
+        return JsonResponse({'results': []})
+    return JsonResponse({'results': suggest(query, limit)})
+
+
+# --- SUBIDA DE IMÁGENES POR PARTES (usada desde el admin) ---
+@staff_member_required
+@require_POST
+def image_upload_start(request):
+    '''
+    Abre una sesión de subida.
+    POST variant, filename, size, checksum (SHA-256 hex), alt_text, is_main  ->  {"id": ..., "offset": 0}
+    '''
+    try:
+        variant = get_object_or_404(ProductVariant, pk=request.POST['variant'])
+        size = int(request.POST['size'])
+        checksum = request.POST['checksum'].lower()
+        filename = os.path.basename(request.POST['filename'])
+    except (KeyError, ValueError):
+        return JsonResponse({'error': "Faltan datos de la subida"}, status=400)
+    alt_text = request.POST.get('alt_text', '')
+
+    # Se valida contra los largos de ImageUpload para responder 400 y no un error de la base de datos
+    if not 0 < size <= max_upload_size():
+        return JsonResponse({'error': f"El tamaño debe estar entre 1 y {max_upload_size()} bytes"}, status=400)
+    if not re.fullmatch(r'[0-9a-f]{64}', checksum):
+        return JsonResponse({'error': "El checksum debe ser un SHA-256 en hexadecimal"}, status=400)
+    if not filename or len(filename) > ImageUpload._meta.get_field('filename').max_length:
+        return JsonResponse({'error': "Nombre de archivo vacío o demasiado largo"}, status=400)
+    if os.path.splitext(filename)[1].lower() not in IMAGE_EXTENSIONS:
+        return JsonResponse({'error': "Extensión de imagen no permitida"}, status=400)
+    if len(alt_text) > ImageUpload._meta.get_field('alt_text').max_length:
+        return JsonResponse({'error': "El texto alternativo es demasiado largo"}, status=400)
+
+    upload = start_upload(
+        variant,
+        filename,
+        size,
+        checksum,
+        alt_text=alt_text,
+        is_main=request.POST.get('is_main') == 'true',
+    )
+    return JsonResponse({'id': str(upload.pk), 'offset': upload.received})
+
+
+@staff_member_required
+@require_GET
+def image_upload_status(request, upload_id):
+    '''
+    Estado de una sesión, para reanudar: {"offset": <bytes recibidos>, "size": <tamaño total>}.
+    '''
+    upload = get_object_or_404(ImageUpload, pk=upload_id, image__isnull=True)
+    return JsonResponse({'offset': upload.received, 'size': upload.size})
+
+
+@staff_member_required
+@require_POST
+def image_upload_chunk(request, upload_id):
+    '''
+    Recibe un chunk como cuerpo crudo (application/octet-stream) con la cabecera X-Upload-Offset.
+    El cuerpo se lee del stream y se escribe a disco de a bloques, sin pasar por el manejo de archivos de Django.
+    '''
+    try:
+        offset = int(request.headers['X-Upload-Offset'])
+        length = int(request.headers['Content-Length'])
+    except (KeyError, ValueError):
+        return JsonResponse({'error': "Falta X-Upload-Offset o Content-Length"}, status=400)
+    try:
+        received = write_chunk(upload_id, offset, request, length)
+    except ImageUpload.DoesNotExist:
+        return JsonResponse({'error': "Sesión de subida inexistente"}, status=404)
+    except UploadError as error:
+        return JsonResponse({'error': str(error), 'offset': error.offset}, status=409)
+    return JsonResponse({'offset': received})
+
+
+@staff_member_required
+@require_POST
+def image_upload_complete(request, upload_id):
+    '''
+    Verifica el checksum y crea el ProductImage: {"image": <id>, "url": <url de la imagen>}.
+    '''
+    try:
+        image = complete_upload(upload_id)
+    except ImageUpload.DoesNotExist:
+        return JsonResponse({'error': "Sesión de subida inexistente"}, status=404)
+    except UploadError as error:
+        return JsonResponse({'error': str(error), 'offset': error.offset}, status=409)
+    return JsonResponse({'image': image.pk, 'url': image.image.url})
@@ -0,0 +1,22 @@
+import json
+
+from django_json_widget.widgets import JSONEditorWidget
+
+
+class LazyJSONEditorWidget(JSONEditorWidget):
+    '''
+    Variante de JSONEditorWidget pensada para inlines con muchas filas.
+    En lugar de crear un JSONEditor por fila al cargar la página, muestra una vista previa del JSON
+    y crea el editor recién cuando se hace clic en "Editar JSON".
+    El textarea se renderiza con el valor actual, así una fila que no se tocó se envía sin cambios
+    y el formset la detecta como no modificada.
+    '''
+    template_name = 'shop/widgets/lazy_json_editor.html'
+
+    class Media:
+        js = ('shop/js/lazy_json_editor.js',)
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget']['json'] = json.dumps(context['widget']['value'], ensure_ascii=False)
+        return context